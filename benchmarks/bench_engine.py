@@ -0,0 +1,56 @@
+"""Flip throughput and per-game memory of the headless engine.
+
+Run from the repository root:  python benchmarks/bench_engine.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine import INVALID, MemoryGame
+from sessions import deep_sizeof
+from symbols import EMOJIS
+
+SIZES = {"Easy (2x2)": (2, 2), "Medium (4x4)": (4, 4), "Hard (6x6)": (6, 6)}
+
+
+def legacy_game(rows, cols, player_names):
+    # The dict-of-lists state the Streamlit script used to keep per session
+    num_pairs = (rows * cols) // 2
+    deck = EMOJIS[:num_pairs] * 2
+    random.shuffle(deck)
+    return {
+        "deck": deck, "flipped": [False] * (rows * cols), "matched": [False] * (rows * cols),
+        "first_choice": None, "second_choice": None, "moves": 0, "score": 0,
+        "waiting": False, "wait_start": None, "start_time": None, "rows": rows, "cols": cols,
+        "num_pairs": num_pairs, "game_over": False, "mode": "Solo", "player_names": player_names,
+        "current_player": 0, "player_scores": [0] * len(player_names), "score_submitted": False,
+        "last_match": False, "game_just_completed": False,
+    }
+
+
+def play_random(game, rng):
+    cells = list(range(game.size))
+    flips = 0
+    while not game.game_over:
+        if game.apply_flip(rng.choice(cells)).outcome != INVALID:
+            flips += 1
+    return flips
+
+
+def main(games=2000):
+    rng = random.Random(1)
+    for label, (rows, cols) in SIZES.items():
+        start = time.perf_counter()
+        flips = sum(play_random(MemoryGame(rows, cols, rng=rng), rng) for _ in range(games))
+        elapsed = time.perf_counter() - start
+        engine_bytes = deep_sizeof(MemoryGame(rows, cols, ["Player"]))
+        legacy_bytes = deep_sizeof(legacy_game(rows, cols, ["Player"]))
+        print(f"{label:14s} {flips / elapsed / 1e3:8.0f}k flips/s  "
+              f"state {engine_bytes:5d} B (dict version {legacy_bytes:5d} B)")
+
+
+if __name__ == "__main__":
+    main()
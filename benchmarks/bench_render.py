@@ -0,0 +1,42 @@
+"""Server-side board render cost and payload size against board size.
+
+Times building the board component's arguments for a mid-game board (what a
+rerun pays to render the board) and reports the JSON payload sent per rerun,
+next to the widget count the old per-cell markdown+button loop emitted.
+
+Run from the repository root:  python benchmarks/bench_render.py
+"""
+import json
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from board_component import board_args
+from engine import DIFFICULTIES, INVALID, MemoryGame
+
+
+def mid_game(rows, cols, rng):
+    # Play random flips until about half the pairs are matched
+    game = MemoryGame(rows, cols, rng=rng)
+    while game.score < game.num_pairs // 2:
+        if game.apply_flip(rng.randrange(game.size)).outcome == INVALID:
+            continue
+    return game
+
+
+def main(number=200):
+    rng = random.Random(1)
+    print(f"{'board':>16} {'cells':>6} {'render':>10} {'payload':>9} {'old widgets':>12}")
+    for label, (rows, cols) in DIFFICULTIES.items():
+        game = mid_game(rows, cols, rng)
+        args = board_args(game)
+        per_render = timeit.timeit(lambda: json.dumps(board_args(game)), number=number) / number
+        payload = len(json.dumps(args).encode())
+        print(f"{label:>16} {game.size:6d} {per_render * 1e6:8.1f}us {payload:8d}B {2 * game.size:12d}")
+
+
+if __name__ == "__main__":
+    main()
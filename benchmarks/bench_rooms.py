@@ -0,0 +1,131 @@
+"""Flip-to-update latency and cost per room under many concurrent rooms.
+
+Each room gets two threads: a player applying pairs through the RoomStore
+with human-like think time, and a viewer that follows the room fragment's
+schedule (project.py): a run every ROOM_POLL_INTERVAL that long-polls the
+room for up to ROOM_LONG_POLL and then renders. Latency is measured from a
+pair being applied to the end of the viewer run that renders it, so a move
+landing between runs pays the wait for the next tick. Network and browser
+paint are not included; --render-ms stands in for the script run.
+
+What a room costs: while it is live (a game on and two or more players
+seated), every seated session pays one fragment run per ROOM_POLL_INTERVAL
+(the runs/s column, per session) and holds a server thread in the long poll
+for up to ROOM_LONG_POLL of each interval (the blocked column). A lobby with
+one player or a finished game sets no timer, so it costs nothing until
+someone clicks. The benchmark restarts finished games, so every room stays
+live for the whole run.
+
+Run from the repository root:
+
+    python benchmarks/bench_rooms.py [--rooms 10 20 50]
+    python benchmarks/bench_rooms.py --interval 2.0 --long-poll 1.75   # the old schedule
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perf import percentile
+from rooms import ROOM_LONG_POLL, ROOM_POLL_INTERVAL, RoomStore
+
+
+def play_room(store, room, moves, rng, latencies, blocked, runs, schedule):
+    interval, long_poll, render_s, think = schedule
+    done = threading.Event()
+    applied_at = {}
+
+    def viewer():
+        seen = room.version
+        waited = 0.0
+        count = 0
+        while not done.is_set():
+            count += 1
+            start = time.perf_counter()
+            store.wait(room, seen, long_poll)
+            waited += time.perf_counter() - start
+            with room.lock:
+                version = room.version  # what this run renders
+            time.sleep(render_s)
+            now = time.perf_counter()
+            for v in range(seen + 1, version + 1):
+                if v in applied_at:
+                    latencies.append((now - applied_at[v]) * 1000)
+            seen = version
+            time.sleep(max(0.0, start + interval - time.perf_counter()))  # next run_every tick
+        blocked.append(waited)
+        runs.append(count)
+
+    thread = threading.Thread(target=viewer)
+    thread.start()
+    for _ in range(moves):
+        time.sleep(rng.uniform(*think))
+        game = room.game
+        if game.game_over:
+            store.restart(room)
+            continue
+        player = room.turn()
+        cells = [i for i in range(game.size) if not game.is_matched(i)]
+        first, second = rng.sample(cells, 2)
+        with room.lock:
+            applied_at[room.version + 1] = time.perf_counter()
+        store.apply_flips(room, player, [first, second], game.version)
+    done.set()
+    thread.join()
+
+
+def run(rooms, moves, schedule):
+    store = RoomStore()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    created = []
+    for k in range(rooms):
+        room = store.create(6, 6, f"host{k}", flip_back_delay=0.05)
+        store.join(room.code, f"guest{k}")
+        created.append(room)
+    per_room = (tracemalloc.get_traced_memory()[0] - before) / rooms
+    tracemalloc.stop()
+
+    latencies = []
+    blocked = []
+    runs = []
+    threads = [
+        threading.Thread(target=play_room,
+                         args=(store, room, moves, random.Random(k), latencies, blocked, runs, schedule))
+        for k, room in enumerate(created)
+    ]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return latencies, per_room, sum(blocked) / (rooms * elapsed), sum(runs) / (rooms * elapsed)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Room push latency under concurrent rooms")
+    parser.add_argument("--rooms", type=int, nargs="+", default=[10, 20, 50])
+    parser.add_argument("--moves", type=int, default=30, help="pairs played per room")
+    parser.add_argument("--interval", type=float, default=ROOM_POLL_INTERVAL, help="fragment run_every (s)")
+    parser.add_argument("--long-poll", type=float, default=ROOM_LONG_POLL, help="longest wait per run (s)")
+    parser.add_argument("--render-ms", type=float, default=30.0, help="script run cost after the wait")
+    parser.add_argument("--think", type=float, nargs=2, default=(0.1, 2.0), help="seconds between pairs")
+    args = parser.parse_args(argv)
+
+    schedule = (args.interval, args.long_poll, args.render_ms / 1000, args.think)
+    print(f"run every {args.interval}s, long poll {args.long_poll}s, render {args.render_ms:g}ms")
+    print(f"{'rooms':>6} {'p50':>9} {'p95':>9} {'max':>9} {'blocked':>8} {'runs/s':>7} {'per room':>10}")
+    for rooms in args.rooms:
+        latencies, per_room, blocked, runs = run(rooms, args.moves, schedule)
+        print(f"{rooms:6d} {percentile(latencies, 50):7.0f}ms {percentile(latencies, 95):7.0f}ms "
+              f"{max(latencies):7.0f}ms {blocked:8.0%} {runs:7.2f} {per_room / 1024:8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Server cost and bytes sent per sound: inline data URI vs a slot in the audio sprite.
+
+Before, every sound was synthesized, encoded as a base64 WAV and sent inline
+with the rerun. Now the browser fetches frontend/board/sprite.wav once and a
+sound event is a slot name (taps are played locally and send nothing).
+
+Run from the repository root:  python benchmarks/bench_sounds.py
+"""
+import os
+import sys
+import json
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sounds import SOUND_BANK, build_sprite, create_audio_data, generate_tone
+
+
+def inline_sounds():
+    # What every sound used to cost: build the sine wave and encode a fresh WAV
+    return {
+        name: create_audio_data(generate_tone(frequency, duration))
+        for name, (frequency, duration) in SOUND_BANK.items()
+    }
+
+
+def sprite_events():
+    # What a sound costs now: a slot name in the component args
+    return [json.dumps({"id": 1, "names": [name]}) for name in SOUND_BANK]
+
+
+def main(number=20):
+    before = timeit.timeit(inline_sounds, number=number) / (number * len(SOUND_BANK))
+    after = timeit.timeit(sprite_events, number=number * 1000) / (number * 1000 * len(SOUND_BANK))
+    print(f"per sound before: {before * 1e6:10.1f} us")
+    print(f"per sound after:  {after * 1e6:10.3f} us")
+    print(f"speedup:          {before / after:10.0f}x")
+
+    wav, slots = build_sprite()
+    uris = inline_sounds()
+    inline = sum(len(f'<audio autoplay><source src="{uri}" type="audio/wav"></audio>') for uri in uris.values())
+    message = sum(len(event) for event in sprite_events())
+    print(f"bytes per sound, inline data URI: {inline / len(uris):10.0f}")
+    print(f"bytes per sound, sprite slot:     {message / len(slots):10.0f}")
+    print(f"sprite, fetched once:             {len(wav):10d} bytes (+{len(json.dumps(slots))} bytes of slots)")
+
+
+if __name__ == "__main__":
+    main()
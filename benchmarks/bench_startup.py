@@ -0,0 +1,73 @@
+"""Cold import time of the app's modules, with a budget.
+
+Runs a fresh interpreter with `-X importtime`, importing every module
+project.py imports except streamlit itself, and fails if the total goes over
+the budget or if a heavy optional library (pandas, numpy, scipy, pyarrow) is pulled in.
+Also times the audio sprite build, which the app pays once per process when
+it writes frontend/board/sprite.wav (a no-op rewrite when it is up to date).
+
+Run from the repository root:  python benchmarks/bench_startup.py [--budget-ms 150]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+APP_MODULES = [
+    "sounds", "leaderboard_index", "leaderboard_store", "leaderboard_writer",
+    "board_component", "engine", "movelog", "rooms", "history", "sessions",
+    "solver", "stats", "symbols", "theme", "perf",
+]
+FORBIDDEN = {"pandas", "numpy", "scipy", "pyarrow"}
+
+
+def import_times(modules):
+    """{module: cumulative microseconds} for every import in a fresh interpreter"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(modules)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        times[name] = int(cumulative)
+    return times
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="App import-time budget")
+    parser.add_argument("--budget-ms", type=float, default=150.0)
+    args = parser.parse_args(argv)
+
+    times = import_times(APP_MODULES)
+    total_ms = sum(times.get(m, 0) for m in APP_MODULES) / 1000
+    for name in APP_MODULES:
+        print(f"{name:20s} {times.get(name, 0) / 1000:8.2f} ms")
+    heaviest = sorted(times.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    print("heaviest:", ", ".join(f"{name} {us / 1000:.1f} ms" for name, us in heaviest))
+    print(f"total {total_ms:.2f} ms (budget {args.budget_ms:.0f} ms)")
+
+    from sounds import build_sprite
+    start = time.perf_counter()
+    build_sprite()
+    print(f"audio sprite build {(time.perf_counter() - start) * 1000:.1f} ms (once per process, off the click path)")
+
+    failures = []
+    loaded = FORBIDDEN & {name.split(".")[0] for name in times}
+    if loaded:
+        failures.append(f"heavy modules imported at startup: {', '.join(sorted(loaded))}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f} ms over the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Page stylesheet cost per rerun: rebuilt inline f-string vs cached static @import.
+
+The inline version is what every full rerun used to send: the whole themed
+stylesheet plus a Google Fonts @import, rebuilt from the f-string each time.
+Now a rerun sends a short <style>@import</style> and the browser fetches the
+static file once.
+
+Run from the repository root:  python benchmarks/bench_theme.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from theme import THEMES, stylesheet, stylesheet_tag
+
+GOOGLE_FONTS = "@import url('https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;700&display=swap');\n"
+
+
+def inline_markdown(theme):
+    # Previous behaviour: build the CSS on every rerun and send it inline
+    return "<style>\n" + GOOGLE_FONTS + stylesheet.__wrapped__(theme) + "</style>\n"
+
+
+def main(number=20000):
+    print(f"{'theme':>6} {'inline':>10} {'static':>10} {'build before':>13} {'build after':>12}")
+    for theme in THEMES:
+        before = len(inline_markdown(theme).encode())
+        after = len(stylesheet_tag(theme).encode())
+        t_before = timeit.timeit(lambda: inline_markdown(theme), number=number) / number
+        t_after = timeit.timeit(lambda: stylesheet_tag(theme), number=number) / number
+        print(f"{theme:>6} {before:9d}B {after:9d}B {t_before * 1e6:11.2f}us {t_after * 1e6:10.2f}us")
+    print("external requests per page load: 1 (fonts.googleapis.com) -> 0")
+
+
+if __name__ == "__main__":
+    main()
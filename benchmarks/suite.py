@@ -0,0 +1,337 @@
+"""Benchmark suite for the game's hot paths, with JSON baselines.
+
+Covers board setup and shuffling per grid size, flip/match/miss resolution,
+tone synthesis and WAV encoding, stylesheet construction, leaderboard load /
+filter / sort / submit / rank at 1k, 100k and 1M rows, and a full scripted
+game through Streamlit's AppTest per difficulty. Names follow pytest-benchmark
+(group[param]); timings come from timeit, keeping the best-of and median of
+several rounds.
+
+Run from the repository root:
+
+    python benchmarks/suite.py run --save baseline
+    python benchmarks/suite.py run -k leaderboard --rows 1000 100000
+    python benchmarks/suite.py run --compare benchmarks/results/baseline.json
+    python benchmarks/suite.py compare benchmarks/results/baseline.json benchmarks/results/new.json
+
+compare exits with status 1 when a median is slower than the baseline by more
+than --threshold percent (default 10), so it can gate changes to project.py.
+
+Timings only compare on the same machine, so no baseline is committed and
+benchmarks/results/ is ignored by git. Make one from the commit you are
+measuring against, then switch back to your change and compare:
+
+    git stash && python benchmarks/suite.py run --save baseline && git stash pop
+    python benchmarks/suite.py run --compare benchmarks/results/baseline.json
+"""
+import argparse
+import atexit
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from engine import DIFFICULTIES, MemoryGame
+from leaderboard_index import LeaderboardIndex
+from leaderboard_store import LeaderboardStore
+from sounds import SOUND_BANK, build_sprite, create_audio_data, generate_tone
+from stats import LeaderboardStats
+from theme import THEMES, stylesheet
+
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+ROW_COUNTS = [1000, 100000, 1000000]
+APPTEST_DIFFICULTIES = ["Easy (2x2)", "Medium (4x4)", "Hard (6x6)"]
+PLAYERS = 1000  # distinct names in the generated leaderboards
+
+BENCHMARKS = []  # (name, setup) where setup() returns (func, rounds or None)
+
+
+def bench(name):
+    def register(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return register
+
+
+def measure(func, rounds=None, repeat=5):
+    """Seconds per call: (best, median, calls timed). With `rounds` given, each repeat is one call"""
+    timer = timeit.Timer(func)
+    if rounds is not None:
+        times = timer.repeat(repeat=rounds, number=1)
+        return min(times), statistics.median(times), rounds
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return min(times), statistics.median(times), number * repeat
+
+
+# Engine
+
+for label, (rows, cols) in DIFFICULTIES.items():
+    @bench(f"test_init_game[{label}]")
+    def _init(rows=rows, cols=cols):
+        rng = random.Random(0)
+        return lambda: MemoryGame(rows, cols, ["Player"], rng=rng), None
+
+    @bench(f"test_shuffle[{label}]")
+    def _shuffle(rows=rows, cols=cols):
+        rng = random.Random(0)
+        deck = list(range(rows * cols // 2)) * 2
+        return lambda: rng.shuffle(deck), None
+
+    @bench(f"test_flip_match_game[{label}]")
+    def _matches(rows=rows, cols=cols):
+        # Every pair found first time: one FIRST and one MATCH flip per pair
+        game = MemoryGame(rows, cols, rng=random.Random(0))
+        positions = {}
+        for cell, face in enumerate(game.deck):
+            positions.setdefault(face, []).append(cell)
+        pairs = list(positions.values())
+
+        def play():
+            board = MemoryGame(rows, cols, deck=game.deck)
+            for first, second in pairs:
+                board.apply_flip(first)
+                board.apply_flip(second)
+        return play, None
+
+    @bench(f"test_flip_miss_resolve[{label}]")
+    def _miss(rows=rows, cols=cols):
+        game = MemoryGame(rows, cols, rng=random.Random(0))
+        other = next(cell for cell in range(1, game.size) if game.deck[cell] != game.deck[0])
+
+        def miss():
+            game.apply_flip(0)
+            game.apply_flip(other)
+            game.resolve_miss()
+        return miss, None
+
+
+# Sounds and styles
+
+for name, (frequency, duration) in SOUND_BANK.items():
+    @bench(f"test_generate_tone[{name}]")
+    def _tone(frequency=frequency, duration=duration):
+        return lambda: generate_tone(frequency, duration), None
+
+    @bench(f"test_create_audio_data[{name}]")
+    def _wav(frequency=frequency, duration=duration):
+        samples = generate_tone(frequency, duration)
+        return lambda: create_audio_data(samples), None
+
+
+@bench("test_build_sprite")
+def _sprite():
+    return build_sprite, None
+
+
+for theme in THEMES:
+    @bench(f"test_css_styles[{theme}]")
+    def _css(theme=theme):
+        # The uncached builder: what a cold process pays once per theme
+        return lambda: stylesheet.__wrapped__(theme), None
+
+
+# Leaderboard
+
+_stores = {}
+
+
+def leaderboard(rows):
+    """A store filled with `rows` generated scores, built once per run in a temporary directory"""
+    if rows not in _stores:
+        directory = tempfile.mkdtemp(prefix="bench-leaderboard-")
+        store = LeaderboardStore(os.path.join(directory, "leaderboard.db"))
+        rng = random.Random(rows)
+        labels = list(DIFFICULTIES)
+        batch = []
+        for i in range(rows):
+            rows_, cols = DIFFICULTIES[labels[i % 4]]
+            pairs = rows_ * cols // 2
+            batch.append((
+                f"player{rng.randrange(PLAYERS)}", labels[i % 4], pairs + rng.randrange(2 * pairs + 1),
+                f"{rng.randrange(10):02d}:{rng.randrange(60):02d}",
+                f"2025-{rng.randrange(1, 13):02d}-{rng.randrange(1, 29):02d} 12:00:00",
+            ))
+            if len(batch) == 100000:
+                store.add_scores(batch)
+                batch = []
+        if batch:
+            store.add_scores(batch)
+        _stores[rows] = (store, directory)
+    return _stores[rows]
+
+
+def leaderboard_benchmarks(rows):
+    difficulty = "Hard (6x6)"
+
+    @bench(f"test_leaderboard_load[{rows}]")
+    def _load():
+        # Cold start: open the database and build the in-memory top 10 / personal bests
+        store, _ = leaderboard(rows)
+        return lambda: LeaderboardIndex(LeaderboardStore(store.path)).rebuild(), 3
+
+    @bench(f"test_leaderboard_filter[{rows}]")
+    def _filter():
+        store, _ = leaderboard(rows)
+        return lambda: store.search(difficulty, name="player7", limit=25), None
+
+    @bench(f"test_leaderboard_sort[{rows}]")
+    def _sort():
+        store, _ = leaderboard(rows)
+        return lambda: store.top_scores(difficulty, 10), None
+
+    @bench(f"test_leaderboard_rank[{rows}]")
+    def _rank():
+        # Through its own connection, so this listener doesn't stay subscribed
+        # to the shared store and slow down the submit benchmark
+        store, directory = leaderboard(rows)
+        stats = LeaderboardStats(LeaderboardStore(store.path), os.path.join(directory, "rank.json"))
+        atexit.unregister(stats.save)  # the directory is gone by exit
+        stats.rank(difficulty, 30)  # fold the rows in before timing
+        return lambda: stats.rank(difficulty, 30), None
+
+    @bench(f"test_leaderboard_submit[{rows}]")
+    def _submit():
+        # One committed row with the index and stats listening, as in the app.
+        # Runs last for its size since every call adds a row
+        store, directory = leaderboard(rows)
+        index = LeaderboardIndex(store)
+        index.rebuild()
+        stats = LeaderboardStats(store, os.path.join(directory, "stats.json"))
+        atexit.unregister(stats.save)
+        stats.rank(difficulty, 30)
+        return lambda: store.add_score("bench", difficulty, 30, "01:00", "2025-06-01 12:00:00"), None
+
+
+for count in ROW_COUNTS:
+    leaderboard_benchmarks(count)
+
+
+# Whole app
+
+for label in APPTEST_DIFFICULTIES:
+    @bench(f"test_apptest_game[{label}]")
+    def _apptest(label=label):
+        # One solo game by the perfect-memory bot, every pair a full script rerun
+        from loadtest import Session
+
+        session = Session(0, "Solo", label, 1, seed=0)
+        session.setup()
+
+        def game():
+            session.play_game()
+            if session.errors:
+                raise RuntimeError(session.errors[0])
+        return game, 3
+
+
+def run(keyword=None, rows=None, skip=()):
+    results = {}
+    for name, setup in BENCHMARKS:
+        if keyword and keyword not in name:
+            continue
+        if rows and "leaderboard" in name and int(name.rsplit("[", 1)[1][:-1]) not in rows:
+            continue
+        if any(word in name for word in skip):
+            continue
+        try:
+            func, rounds = setup()
+        except ImportError as exc:
+            print(f"{name:48s} skipped ({exc})")
+            continue
+        best, median, calls = measure(func, rounds)
+        results[name] = {"min": best, "median": median, "calls": calls}
+        print(f"{name:48s} {_format(median):>10s} median  {_format(best):>10s} min  ({calls} calls)")
+    for _, directory in _stores.values():
+        shutil.rmtree(directory, ignore_errors=True)
+    _stores.clear()
+    return results
+
+
+def _format(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.2f} {unit}"
+    return f"{seconds * 1e9:.0f} ns"
+
+
+def save(results, name):
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{name}.json")
+    document = {
+        "machine": {"python": platform.python_version(), "platform": platform.platform(),
+                    "processor": platform.processor()},
+        "datetime": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": results,
+    }
+    with open(path, "w") as f:
+        json.dump(document, f, indent=2)
+    return path
+
+
+def compare(baseline, results, threshold):
+    """Print median changes against a baseline; returns the names that regressed past `threshold` percent"""
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old is None:
+            print(f"{name:48s} {'new':>10s}")
+            continue
+        change = (new["median"] - old["median"]) / old["median"] * 100
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:48s} {_format(old['median']):>10s} -> {_format(new['median']):>10s}  ({change:+.1f}%){flag}")
+    return regressions
+
+
+def _load(path):
+    with open(path) as f:
+        return json.load(f)["benchmarks"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hot-path benchmark suite")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_cmd = sub.add_parser("run", help="run the benchmarks")
+    run_cmd.add_argument("-k", dest="keyword", help="only benchmarks whose name contains this")
+    run_cmd.add_argument("--rows", type=int, nargs="+", choices=ROW_COUNTS, help="leaderboard sizes to run")
+    run_cmd.add_argument("--skip-apptest", action="store_true", help="leave out the full-app games")
+    run_cmd.add_argument("--save", metavar="NAME", help=f"write the results to {RESULTS_DIR}/NAME.json")
+    run_cmd.add_argument("--compare", metavar="BASELINE", help="compare against a saved result")
+    run_cmd.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    compare_cmd = sub.add_parser("compare", help="compare two saved results")
+    compare_cmd.add_argument("baseline")
+    compare_cmd.add_argument("new")
+    compare_cmd.add_argument("--threshold", type=float, default=10.0, help="regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    if args.command == "compare":
+        results = _load(args.new)
+        baseline = _load(args.baseline)
+    else:
+        results = run(args.keyword, args.rows, ("apptest",) if args.skip_apptest else ())
+        if args.save:
+            print(f"saved {save(results, args.save)}")
+        if not args.compare:
+            return 0
+        baseline = _load(args.compare)
+    regressions = compare(baseline, results, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} benchmarks regressed by more than {args.threshold:g}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+import os
+from functools import lru_cache
+
+from symbols import card_faces
+
+# Static frontend, no build step: frontend/board/index.html speaks the
+# component protocol directly
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "board")
+
+@lru_cache(maxsize=None)
+def _memory_board():
+    # Declared on first use so board_args can be benchmarked without Streamlit
+    import streamlit.components.v1 as components
+    return components.declare_component("memory_board", path=_FRONTEND_DIR)
+
+def board_args(game, wait_seconds=None, locked=False, theme="Light", sound=True, ack=None, lock_on_miss=False,
+               sound_event=None):
+    """Component arguments for a MemoryGame, all sent on every rerun: the face
+    catalog (one entry per pair), the deck as indices into it, one state
+    character per cell, and the state version"""
+    return dict(
+        faces=[list(face) for face in card_faces(game.num_pairs)],
+        deck=game.deck.tolist(),
+        state=game.cell_states(),
+        cols=game.cols,
+        waiting=wait_seconds is not None,
+        wait_ms=int(max(0.0, wait_seconds or 0.0) * 1000),
+        locked=locked,
+        theme=theme,
+        sound=sound,
+        version=game.version,
+        ack=ack,
+        lock_on_miss=lock_on_miss,
+        sound_event=sound_event,
+    )
+
+def memory_board(game, wait_seconds=None, locked=False, theme="Light", sound=True, ack=None,
+                 lock_on_miss=False, sound_event=None, key=None):
+    """Render the whole board as one component.
+
+    Flips are played out in the browser straight away; the component reports
+    completed pairs as {"id": ..., "version": ..., "flips": [cell, ...]}, where
+    version is the game.version the clicks were made on. Clicks made while an
+    event is waiting for the server are queued and sent together after the
+    next render, whose `ack` (the last handled event id) tells the browser its
+    event landed. While a missed pair is showing (wait_seconds is not None) the
+    browser flips it back with a single timer and reports
+    {"id": ..., "version": ..., "expire": True} at the deadline. With
+    lock_on_miss the board stops taking clicks after a local miss (the turn
+    passes to another device).
+
+    Sounds come from one audio sprite (frontend/board/sprite.wav, written by
+    sounds.write_sprite) that the browser fetches once and caches. The board
+    plays its own taps locally; `sound_event` = {"id": ..., "names": [...]}
+    names sprite slots to play for moves made elsewhere, once per new id.
+    """
+    return _memory_board()(
+        **board_args(game, wait_seconds, locked, theme, sound, ack, lock_on_miss, sound_event),
+        key=key,
+        default=None,
+    )
@@ -0,0 +1,253 @@
+import math
+import random
+import struct
+import time
+from array import array
+from typing import NamedTuple, Optional
+
+from symbols import card_faces
+
+# Board sizes offered by the app, as (rows, cols)
+DIFFICULTIES = {
+    "Easy (2x2)": (2, 2),
+    "Medium (4x4)": (4, 4),
+    "Hard (6x6)": (6, 6),
+    "Expert (8x8)": (8, 8),
+    "Master (10x10)": (10, 10),
+    "Epic (12x12)": (12, 12),
+    "Huge (16x16)": (16, 16),
+    "Giant (20x20)": (20, 20),
+}
+
+# Outcomes of MemoryGame.apply_flip
+INVALID = "invalid"      # card can't be flipped (out of range, face up or matched, game over)
+FIRST = "first"          # first card of a pair
+MATCH = "match"          # second card matches the first
+MISS = "miss"            # second card doesn't match; pair stays up until resolve_miss()
+GAME_OVER = "game_over"  # the match that completed the board
+
+
+class FlipResult(NamedTuple):
+    outcome: str
+    index: int
+    other: Optional[int] = None  # first card of the pair, for MATCH / MISS / GAME_OVER
+    player: int = 0              # player who made the flip
+
+
+class MemoryGame:
+    """Headless memory game: deck as a compact array of card_faces indices, card state as bitmasks"""
+
+    __slots__ = (
+        "rows", "cols", "num_pairs", "deck", "flipped", "matched",
+        "first_choice", "second_choice", "moves", "score", "waiting",
+        "player_names", "current_player", "player_scores",
+        "start_time", "end_time", "last_match", "version", "resolved_version",
+    )
+
+    def __init__(self, rows, cols, player_names=("",), deck=None, rng=random):
+        self.rows = rows
+        self.cols = cols
+        self.num_pairs = (rows * cols) // 2
+        if deck is None:
+            deck = list(range(self.num_pairs)) * 2
+            rng.shuffle(deck)
+        self.deck = array("B" if self.num_pairs <= 256 else "H", deck)
+        self.flipped = 0  # face-up, unmatched cards
+        self.matched = 0
+        self.first_choice = None
+        self.second_choice = None
+        self.moves = 0
+        self.score = 0
+        self.waiting = False
+        self.player_names = list(player_names)
+        self.current_player = 0
+        self.player_scores = [0] * len(self.player_names)
+        self.start_time = None
+        self.end_time = None
+        self.last_match = False
+        self.version = 0  # bumped on every state change, so stale client input can be detected
+        self.resolved_version = None  # version just before a missed pair flipped back, until the next flip
+
+    @property
+    def size(self):
+        return len(self.deck)
+
+    @property
+    def game_over(self):
+        return self.score == self.num_pairs
+
+    def face(self, i):
+        """(symbol, color) of card i"""
+        return card_faces(self.num_pairs)[self.deck[i]]
+
+    def faces(self):
+        return [card_faces(self.num_pairs)[k] for k in self.deck]
+
+    def cell_states(self):
+        """One character per cell: 0 face down, 1 face up, 2 matched"""
+        out = bytearray(b"0" * len(self.deck))
+        for mask, code in ((self.flipped, 49), (self.matched, 50)):
+            while mask:
+                low = mask & -mask
+                out[low.bit_length() - 1] = code
+                mask ^= low
+        return out.decode()
+
+    def is_flipped(self, i):
+        return bool(self.flipped >> i & 1)
+
+    def is_matched(self, i):
+        return bool(self.matched >> i & 1)
+
+    def is_current(self, version):
+        """True if input made at `version` still applies to this state.
+
+        Flipping a missed pair back (on a timer) changes the version but not
+        which cards can be flipped, so input made just before it still counts.
+        """
+        return version == self.version or (version is not None and version == self.resolved_version)
+
+    def can_flip(self, i):
+        """True if card i is face down and the game is still running"""
+        if self.game_over or not 0 <= i < len(self.deck):
+            return False
+        # A missed pair is still face up, but flipping it back is implied
+        face_up = self.matched if self.waiting else self.matched | self.flipped
+        return not face_up >> i & 1
+
+    def apply_flip(self, i):
+        """Flip card i and return a FlipResult; a pending miss is resolved first"""
+        if not self.can_flip(i):
+            return FlipResult(INVALID, i, player=self.current_player)
+        if self.waiting:
+            self.resolve_miss()
+        if self.start_time is None:
+            self.start_time = time.time()
+        self.version += 1
+        self.resolved_version = None
+
+        player = self.current_player
+        bit = 1 << i
+        if self.first_choice is None:
+            self.first_choice = i
+            self.flipped |= bit
+            return FlipResult(FIRST, i, player=player)
+
+        first = self.first_choice
+        self.second_choice = i
+        self.moves += 1
+        if self.deck[first] == self.deck[i]:
+            pair = bit | 1 << first
+            self.matched |= pair
+            self.flipped &= ~pair
+            self.score += 1
+            self.player_scores[player] += 1
+            self.first_choice = self.second_choice = None
+            self.last_match = True
+            if self.game_over:
+                self.end_time = time.time()
+                return FlipResult(GAME_OVER, i, first, player)
+            # A match earns the same player another turn
+            return FlipResult(MATCH, i, first, player)
+
+        self.flipped |= bit
+        self.waiting = True
+        self.last_match = False
+        return FlipResult(MISS, i, first, player)
+
+    def resolve_miss(self):
+        """Flip a missed pair back and pass the turn to the next player"""
+        if not self.waiting:
+            return
+        self.flipped = 0
+        self.first_choice = self.second_choice = None
+        self.waiting = False
+        self.last_match = False
+        self.current_player = (self.current_player + 1) % len(self.player_names)
+        self.resolved_version = self.version
+        self.version += 1
+
+    # Snapshot layout: magic and format version, fixed header, then
+    # flipped/matched bitmasks, deck, player scores and the "\x1f"-joined names.
+    # Format 1 (no magic, no game version) is still read; bump SNAPSHOT_FORMAT
+    # and keep a reader for the old layout whenever the header changes
+    SNAPSHOT_MAGIC = b"MG"
+    SNAPSHOT_FORMAT = 2
+    _PREFIX = struct.Struct("<2sB")
+    _SNAPSHOT = struct.Struct("<BBBBHHIIHHHdd")
+    _SNAPSHOT_V1 = struct.Struct("<BBBBHHIHHHdd")
+    _NONE = 0xFFFF
+
+    def to_bytes(self):
+        """Compact snapshot of the whole game state"""
+        n = len(self.deck)
+        mask_len = (n + 7) // 8
+        names = "\x1f".join(self.player_names).encode()
+        flags = self.waiting | self.last_match << 1 | (self.deck.typecode == "H") << 2
+        header = self._SNAPSHOT.pack(
+            self.rows, self.cols, len(self.player_names), flags, self.current_player, self.score,
+            self.moves, self.version,
+            self._NONE if self.first_choice is None else self.first_choice,
+            self._NONE if self.second_choice is None else self.second_choice,
+            len(names),
+            float("nan") if self.start_time is None else self.start_time,
+            float("nan") if self.end_time is None else self.end_time,
+        )
+        return b"".join((
+            self._PREFIX.pack(self.SNAPSHOT_MAGIC, self.SNAPSHOT_FORMAT),
+            header,
+            self.flipped.to_bytes(mask_len, "little"),
+            self.matched.to_bytes(mask_len, "little"),
+            self.deck.tobytes(),
+            array("H", self.player_scores).tobytes(),
+            names,
+        ))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Rebuild a game from to_bytes() output (same byte order machine); ValueError if unreadable"""
+        if data[:2] == cls.SNAPSHOT_MAGIC:
+            _, fmt = cls._PREFIX.unpack_from(data)
+            if fmt != cls.SNAPSHOT_FORMAT:
+                raise ValueError(f"unsupported snapshot format {fmt}")
+            offset = cls._PREFIX.size
+            (rows, cols, players, flags, current_player, score, moves, version,
+             first, second, names_len, start, end) = cls._SNAPSHOT.unpack_from(data, offset)
+            offset += cls._SNAPSHOT.size
+        else:
+            # Format 1, written before snapshots carried the game version
+            try:
+                (rows, cols, players, flags, current_player, score, moves,
+                 first, second, names_len, start, end) = cls._SNAPSHOT_V1.unpack_from(data)
+            except struct.error:
+                raise ValueError("not a game snapshot") from None
+            version = 0
+            offset = cls._SNAPSHOT_V1.size
+        n = rows * cols
+        mask_len = (n + 7) // 8
+        deck_size = 2 if flags & 4 else 1
+        if len(data) != offset + 2 * mask_len + n * deck_size + 2 * players + names_len:
+            raise ValueError("truncated or corrupt game snapshot")
+        flipped = int.from_bytes(data[offset:offset + mask_len], "little")
+        offset += mask_len
+        matched = int.from_bytes(data[offset:offset + mask_len], "little")
+        offset += mask_len
+        deck = array("H" if flags & 4 else "B")
+        deck.frombytes(data[offset:offset + n * deck.itemsize])
+        offset += n * deck.itemsize
+        scores = array("H")
+        scores.frombytes(data[offset:offset + 2 * players])
+        offset += 2 * players
+        names = data[offset:offset + names_len].decode().split("\x1f")
+
+        game = cls(rows, cols, names, deck=deck)
+        game.flipped, game.matched = flipped, matched
+        game.first_choice = None if first == cls._NONE else first
+        game.second_choice = None if second == cls._NONE else second
+        game.moves, game.score, game.version = moves, score, version
+        game.waiting, game.last_match = bool(flags & 1), bool(flags & 2)
+        game.current_player = current_player
+        game.player_scores = scores.tolist()
+        game.start_time = None if math.isnan(start) else start
+        game.end_time = None if math.isnan(end) else end
+        return game
@@ -0,0 +1,154 @@
+"""Full leaderboard history: paginated search and a columnar archive.
+
+The app searches history through LeaderboardStore.search, which rides the
+(difficulty, moves, date), (name, difficulty, moves, date) and, for date
+ranges, (difficulty, date) indexes, and pages by key rather than OFFSET, so a
+page costs the same at a thousand rows or millions.
+
+For archiving and bulk analysis the rows can also be exported to a Parquet
+dataset partitioned by difficulty and month (needs the optional pyarrow).
+Columns are typed once at export (moves int32, time in seconds, date as a
+timestamp), and ParquetHistory.search pushes the difficulty, player and
+date filters down to partition pruning and row-group statistics.
+
+    python history.py export leaderboard.db history/
+    python history.py search history/ "Hard (6x6)" --player Ann --days 7
+"""
+import argparse
+import os
+from datetime import datetime, timedelta
+
+from leaderboard_store import LeaderboardStore, duration_seconds
+
+# pyarrow is optional and slow to import; it is loaded by ParquetHistory, not
+# on import, because the app imports this module for since_days
+pa = pc = ds = pq = None
+
+HISTORY_DIR = os.environ.get("HISTORY_DIR", "history")
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+EXPORT_KEY = "exported:parquet"
+
+
+def since_days(days, now=None):
+    """Date string `days` before `now`, in the leaderboard's date format"""
+    return ((now or datetime.utcnow()) - timedelta(days=days)).strftime(DATE_FORMAT)
+
+
+def _duration(seconds):
+    return None if seconds is None else f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+
+def _import_pyarrow():
+    global pa, pc, ds, pq
+    if pa is not None:
+        return
+    try:
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+        import pyarrow as pa
+    except ImportError:  # the archive is optional; the app's search works without it
+        raise RuntimeError("the Parquet archive needs pyarrow (pip install pyarrow)") from None
+
+
+class ParquetHistory:
+    """Parquet archive of the leaderboard, partitioned by difficulty and month"""
+
+    def __init__(self, root=HISTORY_DIR):
+        _import_pyarrow()
+        self.root = root
+        self.schema = pa.schema([
+            ("name", pa.string()),
+            ("moves", pa.int32()),
+            ("time_s", pa.int32()),
+            ("date", pa.timestamp("s")),
+            ("difficulty", pa.string()),
+            ("month", pa.string()),
+        ])
+
+    def export(self, store, batch=100000):
+        """Append rows added to the store since the last export; returns how many were written"""
+        last_id = int(store.get_meta(EXPORT_KEY, 0))
+        written = 0
+        while True:
+            rows = store.rows_after(last_id, batch)
+            if not rows:
+                return written
+            dates = [datetime.strptime(row[5], DATE_FORMAT) for row in rows]
+            table = pa.table({
+                "name": [row[1] for row in rows],
+                "moves": [row[3] for row in rows],
+                "time_s": [duration_seconds(row[4]) for row in rows],
+                "date": dates,
+                "difficulty": [row[2] for row in rows],
+                "month": [d.strftime("%Y-%m") for d in dates],
+            }, schema=self.schema)
+            pq.write_to_dataset(
+                table, self.root, partition_cols=["difficulty", "month"],
+                # replace_all restarts the row ids, so the generation keeps the
+                # files of an export after a clear apart from the earlier ones
+                basename_template=f"part-{store.generation()}-{last_id + 1}-{{i}}.parquet",
+            )
+            last_id = rows[-1][0]
+            store.set_meta(EXPORT_KEY, last_id)
+            written += len(rows)
+
+    def search(self, difficulty, name=None, since=None, limit=25, offset=0):
+        """Same filters and row order as LeaderboardStore.search (without the id), paged by offset"""
+        if not os.path.isdir(self.root):
+            return []
+        partitioning = ds.partitioning(
+            pa.schema([("difficulty", pa.string()), ("month", pa.string())]), flavor="hive"
+        )
+        dataset = ds.dataset(self.root, format="parquet", partitioning=partitioning, schema=self.schema)
+        condition = ds.field("difficulty") == difficulty
+        if name:
+            condition &= ds.field("name") == name
+        if since:
+            start = datetime.strptime(since, DATE_FORMAT)
+            # The month filter prunes whole partitions; the date filter the rest
+            condition &= ds.field("month") >= start.strftime("%Y-%m")
+            condition &= ds.field("date") >= pa.scalar(start, pa.timestamp("s"))
+        table = dataset.to_table(columns=["name", "moves", "time_s", "date"], filter=condition)
+        if table.num_rows == 0:
+            return []
+        keys = [("moves", "ascending"), ("date", "ascending")]
+        k = min(offset + limit, table.num_rows)
+        table = table.take(pc.select_k_unstable(table, k=k, sort_keys=keys)).sort_by(keys)
+        table = table.slice(offset, limit)
+        return [
+            (row["name"], difficulty, row["moves"], _duration(row["time_s"]), row["date"].strftime(DATE_FORMAT))
+            for row in table.to_pylist()
+        ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Leaderboard history archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    export_cmd = sub.add_parser("export", help="append new leaderboard rows to the Parquet archive")
+    export_cmd.add_argument("db", nargs="?", default="leaderboard.db")
+    export_cmd.add_argument("root", nargs="?", default=HISTORY_DIR)
+    search_cmd = sub.add_parser("search", help="query the archive")
+    search_cmd.add_argument("root")
+    search_cmd.add_argument("difficulty")
+    search_cmd.add_argument("--player")
+    search_cmd.add_argument("--days", type=int, help="only the last N days")
+    search_cmd.add_argument("--page", type=int, default=1)
+    search_cmd.add_argument("--page-size", type=int, default=25)
+    args = parser.parse_args(argv)
+
+    if args.command == "export":
+        written = ParquetHistory(args.root).export(LeaderboardStore(args.db))
+        print(f"exported {written} rows to {args.root}")
+        return
+
+    since = since_days(args.days) if args.days else None
+    rows = ParquetHistory(args.root).search(
+        args.difficulty, args.player, since, args.page_size, (args.page - 1) * args.page_size
+    )
+    for rank, (name, _, moves, duration, date) in enumerate(rows, (args.page - 1) * args.page_size + 1):
+        print(f"{rank:5d}  {name:20s} {moves:5d} moves  {duration or '--:--'}  {date}")
+
+
+if __name__ == "__main__":
+    main()
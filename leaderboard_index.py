@@ -0,0 +1,73 @@
+"""Process-wide in-memory leaderboard index.
+
+Per difficulty it keeps the best `top_n` rows (ordered by moves, then date) and
+each player's best row, so leaderboard and personal-best lookups don't touch
+the database. Rows appended through the store are folded in as they commit;
+anything else (a clear, a CSV import, another process writing) changes the
+store's version and triggers one rebuild on the next read.
+"""
+import bisect
+import threading
+
+
+def _rank(row):
+    return (row[2], row[4])
+
+
+class LeaderboardIndex:
+    """Top-N and per-player best rows per difficulty, kept in sync with a LeaderboardStore"""
+
+    def __init__(self, store, top_n=10):
+        self.store = store
+        self.top_n = top_n
+        self.version = None
+        self._top = {}    # difficulty -> [(rank, row)], sorted, at most top_n long
+        self._best = {}   # difficulty -> {name: row}
+        self._lock = threading.Lock()
+        store.subscribe(self._on_append)
+
+    def _add(self, row, top=None, best=None):
+        key = (_rank(row), row)
+        top = (self._top if top is None else top).setdefault(row[1], [])
+        if len(top) < self.top_n or key < top[-1]:
+            bisect.insort(top, key)
+            del top[self.top_n:]
+        best = (self._best if best is None else best).setdefault(row[1], {})
+        current = best.get(row[0])
+        if current is None or _rank(row) < _rank(current):
+            best[row[0]] = row
+
+    def _on_append(self, rows, old_version, new_version):
+        with self._lock:
+            # Only fold in appends on top of the state we already reflect
+            if self.version != old_version:
+                return
+            for row in rows:
+                self._add(row)
+            self.version = new_version
+
+    def rebuild(self):
+        # Scan without holding our lock: the store calls _on_append with its
+        # own lock held, so taking ours first here could deadlock
+        top, best = {}, {}
+        version = self.store.scan(lambda row: self._add(row, top, best))
+        with self._lock:
+            self._top, self._best, self.version = top, best, version
+
+    def _sync(self):
+        if self.version != self.store.version():
+            self.rebuild()
+
+    def top_scores(self, difficulty, limit=10):
+        """Best rows for a difficulty, ordered by moves then date"""
+        if limit > self.top_n:
+            return self.store.top_scores(difficulty, limit)
+        self._sync()
+        with self._lock:
+            return [row for _, row in self._top.get(difficulty, [])[:limit]]
+
+    def personal_best(self, name, difficulty):
+        """Best row for one player on a difficulty, or None"""
+        self._sync()
+        with self._lock:
+            return self._best.get(difficulty, {}).get(name)
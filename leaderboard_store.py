@@ -0,0 +1,243 @@
+import csv
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+
+COLUMNS = ["Name", "Difficulty", "Moves", "Time", "Date"]
+
+log = logging.getLogger(__name__)
+
+
+def duration_seconds(duration):
+    """Seconds in a leaderboard "MM:SS" time, or None if it is missing or malformed"""
+    if not duration:
+        return None
+    minutes, _, seconds = duration.partition(":")
+    try:
+        return int(minutes) * 60 + int(seconds or 0)
+    except ValueError:
+        return None
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    moves INTEGER NOT NULL,
+    time TEXT,
+    date TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_rank ON scores (difficulty, moves, date);
+CREATE INDEX IF NOT EXISTS idx_scores_player ON scores (name, difficulty, moves, date);
+CREATE INDEX IF NOT EXISTS idx_scores_recent ON scores (difficulty, date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class LeaderboardStore:
+    """SQLite leaderboard in WAL mode, shared by every session in the process"""
+
+    def __init__(self, path):
+        self.path = path
+        # Streamlit runs each script rerun on its own thread, so share one
+        # connection behind a lock instead of opening one per thread
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()
+        self._writes = 0        # commits made through this store
+        self._listeners = []    # called with (rows, old_version, new_version) after appends
+        self._reset_listeners = []  # called with no arguments after replace_all
+        with self._lock:
+            self._conn.executescript(SCHEMA)
+            with self._conn as conn:
+                conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', ?)",
+                             (secrets.token_hex(8),))
+
+    def version(self):
+        """Changes whenever the scores may have changed, here or through another connection"""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return (self._writes, data_version)
+
+    def subscribe(self, listener):
+        """Register listener(rows, old_version, new_version) for rows appended through this store"""
+        self._listeners.append(listener)
+
+    def subscribe_reset(self, listener):
+        """Register listener() for replace_all (the table's rows were swapped out)"""
+        self._reset_listeners.append(listener)
+
+    def generation(self):
+        """Changes whenever the table is replaced, here or through another connection; appends keep it"""
+        return self.get_meta("generation")
+
+    def _appended(self, rows):
+        # Called with the lock held, right after the commit. The rows are in, so
+        # a failing listener is logged, never raised to a caller that might retry
+        old = self.version()
+        self._writes += 1
+        new = (self._writes, old[1])
+        for listener in self._listeners:
+            try:
+                listener(rows, old, new)
+            except Exception:
+                log.exception("leaderboard listener %r failed", listener)
+
+    def add_score(self, name, difficulty, moves, time, date):
+        """Insert a single leaderboard row"""
+        self.add_scores([(name, difficulty, moves, time, date)])
+
+    def add_scores(self, rows):
+        """Insert many (name, difficulty, moves, time, date) rows in one transaction"""
+        rows = [(name, diff, int(moves), t, date) for name, diff, moves, t, date in rows]
+        with self._lock:
+            with self._conn as conn:
+                conn.executemany(
+                    "INSERT INTO scores (name, difficulty, moves, time, date) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            self._appended(rows)
+
+    def top_scores(self, difficulty, limit=10):
+        """Best rows for a difficulty, ordered by moves then date"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT name, difficulty, moves, time, date FROM scores "
+                "WHERE difficulty = ? ORDER BY moves, date LIMIT ?",
+                (difficulty, limit),
+            ).fetchall()
+
+    def personal_best(self, name, difficulty):
+        """Best row for one player on a difficulty, or None"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT name, difficulty, moves, time, date FROM scores "
+                "WHERE name = ? AND difficulty = ? ORDER BY moves, date LIMIT 1",
+                (name, difficulty),
+            ).fetchone()
+
+    def search(self, difficulty, name=None, since=None, limit=25, after=None):
+        """One page of a difficulty's history, best first, optionally for one player or since a date.
+
+        Rows are (name, difficulty, moves, time, date, id). Pass the last row's
+        (moves, date, id) as `after` for the next page: keyset paging costs the
+        same on page 1 and page 1000, where OFFSET re-walks every earlier row.
+        """
+        if since and not name:
+            # Only the rows in the date range are read and sorted; walking the
+            # rank index instead would visit the whole difficulty to find them
+            sql = "SELECT name, difficulty, moves, time, date, id FROM scores INDEXED BY idx_scores_recent WHERE difficulty = ?"
+        else:
+            sql = "SELECT name, difficulty, moves, time, date, id FROM scores WHERE difficulty = ?"
+        params = [difficulty]
+        if name:
+            sql += " AND name = ?"
+            params.append(name)
+        if since:
+            sql += " AND date >= ?"
+            params.append(since)
+        if after:
+            sql += " AND (moves, date, id) > (?, ?, ?)"
+            params += list(after)
+        sql += " ORDER BY moves, date, id LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def rows_after(self, last_id, limit=100000):
+        """(id, name, difficulty, moves, time, date) rows with id > last_id, oldest first"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT id, name, difficulty, moves, time, date FROM scores WHERE id > ? ORDER BY id LIMIT ?",
+                (last_id, limit),
+            ).fetchall()
+
+    def changes_after(self, last_id, limit=100000):
+        """(version, rows_after(last_id, limit)), read together so the version covers exactly those rows"""
+        with self._lock:
+            return self.version(), self.rows_after(last_id, limit)
+
+    def last_id(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM scores").fetchone()[0]
+
+    def get_meta(self, key, default=None):
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def set_meta(self, key, value):
+        with self._lock, self._conn as conn:
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    def all_rows(self):
+        with self._lock:
+            return self._conn.execute(
+                "SELECT name, difficulty, moves, time, date FROM scores ORDER BY id"
+            ).fetchall()
+
+    def scan(self, consume):
+        """Feed every row to consume(row) and return the version they reflect"""
+        with self._lock:
+            version = self.version()
+            for row in self._conn.execute("SELECT name, difficulty, moves, time, date FROM scores"):
+                consume(row)
+            return version
+
+    def replace_all(self, rows):
+        """Replace the whole leaderboard with the given (name, difficulty, moves, time, date) rows"""
+        with self._lock, self._conn as conn:
+            conn.execute("DELETE FROM scores")
+            # Row ids can be reused once the table is emptied, so archive exports start over
+            conn.execute("DELETE FROM meta WHERE key LIKE 'exported:%'")
+            conn.executemany(
+                "INSERT INTO scores (name, difficulty, moves, time, date) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.execute("UPDATE meta SET value = ? WHERE key = 'generation'", (secrets.token_hex(8),))
+            self._writes += 1
+        with self._lock:
+            for listener in self._reset_listeners:
+                try:
+                    listener()
+                except Exception:
+                    log.exception("leaderboard reset listener %r failed", listener)
+
+    def import_csv(self, csv_path):
+        """One-time import of a legacy leaderboard CSV; returns the number of rows imported"""
+        if not os.path.exists(csv_path):
+            return 0
+        # Keyed on the file's identity as well as its path: on a case-insensitive
+        # filesystem leaderboard.csv and Leaderboard.csv are the same file
+        info = os.stat(csv_path)
+        keys = ("imported:" + os.path.normcase(os.path.abspath(csv_path)),
+                f"imported:file:{info.st_dev}:{info.st_ino}")
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = [
+                (
+                    row.get("Name") or "",
+                    row["Difficulty"],
+                    int(row["Moves"]),
+                    row.get("Time") or None,
+                    row["Date"],
+                )
+                for row in csv.DictReader(f)
+                if row.get("Difficulty") and row.get("Moves")
+            ]
+        with self._lock, self._conn as conn:
+            if conn.execute("SELECT 1 FROM meta WHERE key IN (?, ?)", keys).fetchone():
+                return 0
+            conn.executemany(
+                "INSERT INTO scores (name, difficulty, moves, time, date) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            conn.executemany("INSERT INTO meta (key, value) VALUES (?, ?)", [(key, str(len(rows))) for key in keys])
+            self._writes += 1
+        return len(rows)
@@ -0,0 +1,100 @@
+"""Background batched leaderboard writer.
+
+Score submissions are queued and written by a daemon thread, so finishing a
+game never waits on disk. Whatever is queued when the thread wakes up goes in
+one executemany transaction. Reads go through the writer and merge rows still
+in the queue, so a player sees their own score before it is flushed.
+"""
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+
+class LeaderboardWriter:
+    """Queues leaderboard rows and flushes them to a LeaderboardStore in batches"""
+
+    def __init__(self, store, index=None, max_batch=500):
+        self.store = store
+        self.reader = index or store  # where committed rows are read from
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._pending = []  # submitted rows not yet committed, in submission order
+        # Held while committing a batch and while reading, so a row is never
+        # seen twice (in the store and still pending) or not at all
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="leaderboard-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.flush, 5.0)
+
+    def submit(self, name, difficulty, moves, time, date):
+        """Queue one row; returns immediately"""
+        row = (name, difficulty, int(moves), time, date)
+        with self._lock:
+            self._pending.append(row)
+        self._queue.put(row)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with self._lock:
+                    retry = False
+                    try:
+                        self.store.add_scores(batch)
+                    except sqlite3.Error:
+                        retry = True  # the transaction rolled back (locked, disk full...)
+                    except Exception:
+                        # Not a storage failure, so retrying won't help: drop the batch
+                        # rather than stop the writer
+                        log.exception("dropping %d leaderboard rows", len(batch))
+                    if not retry:
+                        for row in batch:
+                            self._pending.remove(row)
+                if retry:
+                    # Keep the rows pending and try them again with the next batch
+                    for row in batch:
+                        self._queue.put(row)
+                    time.sleep(1.0)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def flush(self, timeout=None):
+        """Block until every queued row is committed; False if `timeout` ran out first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def pending(self, difficulty=None):
+        with self._lock:
+            return [row for row in self._pending if difficulty is None or row[1] == difficulty]
+
+    def top_scores(self, difficulty, limit=10):
+        """Store's top rows merged with queued ones, ordered by moves then date"""
+        with self._lock:
+            rows = self.reader.top_scores(difficulty, limit)
+            rows += [row for row in self._pending if row[1] == difficulty]
+        return sorted(rows, key=lambda row: (row[2], row[4]))[:limit]
+
+    def personal_best(self, name, difficulty):
+        with self._lock:
+            best = self.reader.personal_best(name, difficulty)
+            rows = [row for row in self._pending if row[0] == name and row[1] == difficulty]
+        if best is not None:
+            rows.append(best)
+        return min(rows, key=lambda row: (row[2], row[4]), default=None)
@@ -0,0 +1,249 @@
+"""Concurrent-session load test through Streamlit's headless AppTest.
+
+Spins up N simulated sessions, each running the real project.py script and
+playing whole games with a scripted perfect-memory bot. Pair clicks are
+injected the way the board component sends them (an {"id", "version", "flips"}
+value under the "board" key). Reports throughput and rerun latency percentiles
+from a timed run of the interleaved sessions, then the memory each session holds after its
+games from a second, traced pass, and saves results so runs can be compared.
+
+    python loadtest.py --sessions 8 --games 2 --modes Solo Multiplayer
+    python loadtest.py --compare loadtest_results/a.json loadtest_results/b.json
+
+AppTest always reruns the whole script, so latencies are full-app reruns
+(an upper bound for the fragment-only reruns a browser triggers). AppTest is
+not thread-safe (each run swaps in a process-wide runtime), so the sessions'
+reruns take turns under one lock: latencies are per-rerun cost with every
+session's state resident and the process-wide stores shared, not contention
+between simultaneous reruns.
+"""
+import argparse
+import gc
+import itertools
+import json
+import os
+import random
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+from engine import DIFFICULTIES
+from perf import percentile
+from simulate import PerfectMemoryStrategy
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "project.py")
+RESULTS_DIR = "loadtest_results"
+DEFAULT_DIFFICULTIES = ["Easy (2x2)", "Medium (4x4)", "Hard (6x6)"]
+_APPTEST_LOCK = threading.Lock()  # one AppTest run at a time, across sessions
+
+
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+class Session:
+    """One simulated browser session driving the app through AppTest"""
+
+    def __init__(self, sid, mode, difficulty, players, seed):
+        from streamlit.testing.v1 import AppTest
+
+        self.sid = sid
+        self.mode = mode
+        self.difficulty = difficulty
+        self.players = players
+        self.rng = random.Random(seed)
+        self.at = AppTest.from_file(APP, default_timeout=120)
+        self.latencies = []
+        self.moves = 0
+        self.games = 0
+        self.errors = []
+        self.seq = 0
+
+    def run(self, step=None):
+        with _APPTEST_LOCK:
+            start = time.perf_counter()
+            (step or self.at).run()
+            self.latencies.append((time.perf_counter() - start) * 1000)
+        if self.at.exception:
+            self.errors.append(str(self.at.exception[0].message))
+
+    def setup(self):
+        self.run()
+        # Sound off, so reruns don't carry audio payloads
+        self.run(_widget(self.at.sidebar.checkbox, "🔊 Sound Effects").uncheck())
+        self.run(_widget(self.at.sidebar.radio, "Game Mode").set_value(self.mode))
+        if self.mode == "Multiplayer":
+            self.run(_widget(self.at.sidebar.slider, "Number of Players").set_value(self.players))
+            for k in range(self.players):
+                self.run(_widget(self.at.sidebar.text_input, f"Player {k + 1} name").input(f"bot{self.sid}-{k}"))
+        else:
+            self.run(_widget(self.at.sidebar.text_input, "Your name").input(f"bot{self.sid}"))
+        self.run(_widget(self.at.sidebar.selectbox, "Difficulty level").select(self.difficulty))
+
+    def send_pair(self, game, first, second):
+        self.seq += 1
+        self.at.session_state["board"] = {
+            "id": f"load-{self.sid}:{self.seq}", "version": game.version, "flips": [first, second],
+        }
+        self.run()
+        self.moves += 1
+
+    def play_game(self):
+        game = self.at.session_state["game_handle"].game
+        bot = PerfectMemoryStrategy(self.rng, game.size)
+        while not game.game_over and not self.errors:
+            first = bot.choose(game, None)
+            bot.observe(first, game.deck[first])
+            second = bot.choose(game, first)
+            bot.observe(second, game.deck[second])
+            moves = game.moves
+            self.send_pair(game, first, second)
+            game = self.at.session_state["game_handle"].game
+            if game.moves == moves and not self.errors:
+                self.errors.append(f"pair {first},{second} was not applied")
+            if game.deck[first] == game.deck[second]:
+                bot.forget(first)
+                bot.forget(second)
+        self.games += 1
+        self.run(_widget(self.at.button, "🔄 New Game").click())
+
+
+def _play(sid, mode, difficulty, players, seed, games, ready=None):
+    session = Session(sid, mode, difficulty, players, seed)
+    try:
+        session.setup()
+    finally:
+        if ready is not None:
+            ready.wait()
+    for _ in range(games):
+        if session.errors:
+            break
+        session.play_game()
+    return session
+
+
+def measure_memory(plan, games, players, seed):
+    """Traced bytes still held per session once every session has played its games.
+
+    A separate, sequential pass: tracemalloc slows every allocation, so the
+    timed run leaves it off.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        # Keep every session alive until the measurement, as a server would
+        sessions = [_play(sid, mode, difficulty, players, seed + sid, games) for sid, mode, difficulty in plan]
+        gc.collect()
+        per_session = (tracemalloc.get_traced_memory()[0] - baseline) / len(sessions)
+    finally:
+        tracemalloc.stop()
+    return per_session
+
+
+def run_load(sessions, games, modes, difficulties, players=2, seed=0, memory=True):
+    # Sessions cycle through every (mode, difficulty) pair, difficulties fastest,
+    # so each difficulty is played once there are at least as many sessions
+    combos = list(itertools.product(modes, difficulties))
+    plan = [(sid,) + combos[sid % len(combos)] for sid in range(sessions)]
+    ready = threading.Barrier(sessions + 1)
+
+    # Sessions set up concurrently; the clock starts once all are ready
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        futures = [pool.submit(_play, sid, mode, difficulty, players, seed + sid, games, ready)
+                   for sid, mode, difficulty in plan]
+        ready.wait()
+        start = time.perf_counter()
+        results = [f.result() for f in futures]
+    elapsed = time.perf_counter() - start
+    per_session = measure_memory(plan, games, players, seed) if memory else None
+
+    latencies = [ms for s in results for ms in s.latencies]
+    by_difficulty = {d: [ms for s in results if s.difficulty == d for ms in s.latencies] for d in difficulties}
+    moves = sum(s.moves for s in results)
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "sessions": sessions,
+        "games_per_session": games,
+        "modes": modes,
+        "difficulties": difficulties,
+        "elapsed_s": round(elapsed, 3),
+        "moves": moves,
+        "moves_per_s": round(moves / elapsed, 2),
+        "reruns": len(latencies),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 2),
+            "p95": round(percentile(latencies, 95), 2),
+            "p99": round(percentile(latencies, 99), 2),
+            "max": round(max(latencies), 2),
+        },
+        "memory_per_session_kb": None if per_session is None else round(per_session / 1024, 1),
+        "errors": [e for s in results for e in s.errors][:20],
+        # None for a difficulty no session played (fewer sessions than difficulties)
+        "per_difficulty": {
+            d: {"p50": round(percentile(samples, 50), 2), "p99": round(percentile(samples, 99), 2)} if samples else None
+            for d, samples in by_difficulty.items()
+        },
+    }
+
+
+def print_result(result):
+    lat = result["latency_ms"]
+    print(f"{result['sessions']} sessions, {result['moves']} moves in {result['elapsed_s']}s "
+          f"-> {result['moves_per_s']} moves/s")
+    print(f"rerun latency p50={lat['p50']}ms p95={lat['p95']}ms p99={lat['p99']}ms max={lat['max']}ms")
+    if result["memory_per_session_kb"] is not None:
+        print(f"memory per session ~{result['memory_per_session_kb']} KB after its games")
+    for d, stats in result["per_difficulty"].items():
+        if stats is None:
+            print(f"  {d:16s} not played (use more sessions)")
+        else:
+            print(f"  {d:16s} p50={stats['p50']}ms p99={stats['p99']}ms")
+    if result["errors"]:
+        print(f"{len(result['errors'])} errors, first: {result['errors'][0]}")
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    rows = [("moves/s", old["moves_per_s"], new["moves_per_s"])]
+    rows += [(f"latency {k}", old["latency_ms"][k], new["latency_ms"][k]) for k in ("p50", "p95", "p99")]
+    if old["memory_per_session_kb"] is not None and new["memory_per_session_kb"] is not None:
+        rows.append(("memory/session KB", old["memory_per_session_kb"], new["memory_per_session_kb"]))
+    for name, a, b in rows:
+        change = (b - a) / a * 100 if a else 0.0
+        print(f"{name:20s} {a:10.2f} -> {b:10.2f}  ({change:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent-session load test")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--games", type=int, default=1, help="games per session")
+    parser.add_argument("--modes", nargs="+", default=["Solo", "Multiplayer"], choices=["Solo", "Multiplayer"])
+    parser.add_argument("--difficulties", nargs="+", default=DEFAULT_DIFFICULTIES, choices=list(DIFFICULTIES))
+    parser.add_argument("--players", type=int, default=2, help="players per multiplayer session")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-memory", action="store_true", help="skip the separate memory pass")
+    parser.add_argument("--out", default=RESULTS_DIR, help="directory for the JSON result")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two saved results")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    result = run_load(args.sessions, args.games, args.modes, args.difficulties, args.players, args.seed,
+                      not args.no_memory)
+    print_result(result)
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"loadtest-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w") as f:
+        json.dump(result, f, indent=2)
+    print(f"saved {path}")
+
+
+if __name__ == "__main__":
+    main()
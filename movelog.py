@@ -0,0 +1,185 @@
+"""Append-only binary move logs, replay and bulk analytics.
+
+One file per game. The header holds the board size, the deck layout and the
+player names; after it, every accepted flip is a 7-byte record: cell (uint16),
+player (uint8) and milliseconds since the game started (uint32, monotonic).
+Flips come in pairs (first card, second card), so matches can be recovered
+from the deck without storing outcomes.
+
+    python movelog.py replay move_logs/some-game.mgl
+    python movelog.py stats move_logs/ --top 10
+"""
+import argparse
+import glob
+import os
+import struct
+import time
+from collections import Counter
+
+from engine import MemoryGame
+
+MOVE_LOG_DIR = os.environ.get("MOVE_LOG_DIR", "move_logs")
+
+MAGIC = b"MGL1"
+HEADER = struct.Struct("<4sBBBdHH")  # magic, rows, cols, players, start wall time, deck length, names length
+RECORD = struct.Struct("<HBI")       # cell, player, ms since start
+
+
+class MoveLog:
+    """Records one game's flips; writes are buffered and appended once per pair"""
+
+    __slots__ = ("path", "start", "buffer")
+
+    def __init__(self, path, game):
+        self.path = path
+        self.start = time.monotonic()
+        names = "\x1f".join(game.player_names).encode()
+        deck = struct.pack(f"<{game.size}H", *game.deck)
+        self.buffer = bytearray(
+            HEADER.pack(MAGIC, game.rows, game.cols, len(game.player_names), time.time(), game.size, len(names))
+            + deck + names
+        )
+
+    def record(self, cell, player):
+        delta = int((time.monotonic() - self.start) * 1000)
+        self.buffer += RECORD.pack(cell, player, min(delta, 0xFFFFFFFF))
+
+    def flush(self):
+        if self.buffer:
+            with open(self.path, "ab") as f:
+                f.write(self.buffer)
+            self.buffer.clear()
+
+
+def new_log_path(directory=MOVE_LOG_DIR):
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, f"{time.strftime('%Y%m%d-%H%M%S')}-{os.urandom(4).hex()}.mgl")
+
+
+def read_header(data):
+    """Header dict and the offset where records start"""
+    magic, rows, cols, players, started, deck_len, names_len = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a move log")
+    offset = HEADER.size
+    deck = struct.unpack_from(f"<{deck_len}H", data, offset)
+    offset += 2 * deck_len
+    names = bytes(data[offset:offset + names_len]).decode().split("\x1f")
+    offset += names_len
+    header = {"rows": rows, "cols": cols, "players": players, "started": started,
+              "deck": deck, "player_names": names}
+    return header, offset
+
+
+def read_log(path):
+    """(header, [(cell, player, ms), ...]) for one log file"""
+    with open(path, "rb") as f:
+        data = f.read()
+    header, offset = read_header(data)
+    end = offset + (len(data) - offset) // RECORD.size * RECORD.size  # ignore a torn last record
+    return header, list(RECORD.iter_unpack(data[offset:end]))
+
+
+def replay(path):
+    """Re-run a logged game through the engine; returns (game, [FlipResult, ...])"""
+    header, records = read_log(path)
+    game = MemoryGame(header["rows"], header["cols"], header["player_names"], deck=header["deck"])
+    results = []
+    for cell, player, _ in records:
+        result = game.apply_flip(cell)
+        if result.player != player:
+            raise ValueError(f"log diverges from the engine at cell {cell}: player {player} vs {result.player}")
+        results.append(result)
+    return game, results
+
+
+def _load_records(path):
+    """Header and records, as a numpy structured memmap when numpy is installed"""
+    try:
+        import numpy as np
+    except ImportError:
+        return read_log(path)
+    with open(path, "rb") as f:
+        head = f.read(HEADER.size)
+        _, _, _, _, _, deck_len, names_len = HEADER.unpack(head)
+        head += f.read(2 * deck_len + names_len)
+    header, offset = read_header(head)
+    count = (os.path.getsize(path) - offset) // RECORD.size
+    dtype = np.dtype([("cell", "<u2"), ("player", "u1"), ("ms", "<u4")])
+    if count == 0:
+        return header, np.zeros(0, dtype)
+    return header, np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(count,))
+
+
+def analyze(paths):
+    """Aggregate stats over many logs: first-match time, per-player accuracy, hot cells"""
+    games = 0
+    first_match_ms = []
+    attempts = Counter()
+    matches = Counter()
+    hot_cells = Counter()  # (rows, cols, cell) -> flips
+    for path in paths:
+        header, records = _load_records(path)
+        deck = header["deck"]
+        names = header["player_names"]
+        board = (header["rows"], header["cols"])
+        games += 1
+        if hasattr(records, "dtype"):
+            cells, players, ms = records["cell"].tolist(), records["player"].tolist(), records["ms"].tolist()
+        else:
+            cells, players, ms = zip(*records) if records else ((), (), ())
+        hot_cells.update(board + (cell,) for cell in cells)
+        first_seen = None
+        for k in range(1, len(cells), 2):
+            name = names[players[k]] or f"Player {players[k] + 1}"
+            attempts[name] += 1
+            if deck[cells[k]] == deck[cells[k - 1]]:
+                matches[name] += 1
+                if first_seen is None:
+                    first_seen = ms[k]
+        if first_seen is not None:
+            first_match_ms.append(first_seen)
+    first_match_ms.sort()
+    return {
+        "games": games,
+        "median_first_match_ms": first_match_ms[len(first_match_ms) // 2] if first_match_ms else None,
+        "accuracy": {name: matches[name] / attempts[name] for name in attempts},
+        "attempts": dict(attempts),
+        "hot_cells": hot_cells,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move log replay and analytics")
+    sub = parser.add_subparsers(dest="command", required=True)
+    replay_cmd = sub.add_parser("replay", help="re-run one game and print its moves")
+    replay_cmd.add_argument("path")
+    stats_cmd = sub.add_parser("stats", help="aggregate stats over a directory of logs")
+    stats_cmd.add_argument("directory", nargs="?", default=MOVE_LOG_DIR)
+    stats_cmd.add_argument("--top", type=int, default=10, help="hot cells to show")
+    args = parser.parse_args(argv)
+
+    if args.command == "replay":
+        game, results = replay(args.path)
+        for result in results:
+            if result.other is not None:
+                print(f"player {result.player}: {result.other} + {result.index} -> {result.outcome}")
+        print(f"{game.moves} moves, {game.score}/{game.num_pairs} pairs, game over: {game.game_over}")
+        return
+
+    paths = sorted(glob.glob(os.path.join(args.directory, "*.mgl")))
+    start = time.perf_counter()
+    stats = analyze(paths)
+    elapsed = time.perf_counter() - start
+    print(f"{stats['games']} games scanned in {elapsed * 1000:.1f} ms")
+    if stats["median_first_match_ms"] is not None:
+        print(f"median time to first match: {stats['median_first_match_ms'] / 1000:.1f}s")
+    for name, accuracy in sorted(stats["accuracy"].items(), key=lambda kv: -kv[1]):
+        print(f"  {name:20s} {accuracy:6.1%} of {stats['attempts'][name]} pairs")
+    print("hot cells (rows x cols, cell, flips):")
+    for (rows, cols, cell), flips in stats["hot_cells"].most_common(args.top):
+        print(f"  {rows}x{cols} #{cell:<4d} {flips}")
+
+
+if __name__ == "__main__":
+    main()
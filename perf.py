@@ -0,0 +1,180 @@
+"""Per-rerun timing spans and metrics export.
+
+Each script run (full app or board fragment) gets a PerfRecorder that times
+named sections. Finished runs go to a process-wide PerfLog, which keeps recent
+records for the sidebar panel and appends them as JSON lines to a metrics file
+every few seconds. Past PERF_METRICS_MAX_BYTES the file is rotated to
+<file>.1, so at most two files' worth is kept.
+
+    python perf.py perf_metrics.jsonl                 # p50/p99 per section
+    python perf.py perf_metrics.jsonl --prometheus    # same, Prometheus text format
+"""
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+
+PERF_METRICS_FILE = os.environ.get("PERF_METRICS_FILE", "perf_metrics.jsonl")
+PERF_METRICS_MAX_BYTES = int(os.environ.get("PERF_METRICS_MAX_BYTES", 16 * 1024 * 1024))
+PERF_FLUSH_INTERVAL = 5.0  # seconds between appends to the metrics file
+
+
+class PerfRecorder:
+    """Timing spans for one script run"""
+
+    __slots__ = ("scope", "trigger", "tags", "spans", "start", "last_lap", "finished")
+
+    def __init__(self, scope, trigger="", **tags):
+        self.scope = scope
+        self.trigger = trigger
+        self.tags = tags
+        self.spans = {}
+        self.start = self.last_lap = time.perf_counter()
+        self.finished = False
+
+    def lap(self, name):
+        """Attribute the time since the previous lap (or the start) to section `name`"""
+        now = time.perf_counter()
+        self.spans[name] = self.spans.get(name, 0.0) + (now - self.last_lap) * 1000
+        self.last_lap = now
+
+    @contextmanager
+    def span(self, name):
+        """Time a nested section; it also counts towards the surrounding lap"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            self.spans[name] = self.spans.get(name, 0.0) + elapsed
+
+    def finish(self, **tags):
+        """Close the run and return its record"""
+        self.finished = True
+        return {
+            "ts": round(time.time(), 3),
+            "scope": self.scope,
+            "trigger": self.trigger,
+            **self.tags,
+            **tags,
+            "total_ms": round((time.perf_counter() - self.start) * 1000, 3),
+            "spans": {name: round(ms, 3) for name, ms in self.spans.items()},
+        }
+
+
+class PerfLog:
+    """Process-wide sink for run records: recent ones in memory, all of them on disk"""
+
+    def __init__(self, path=PERF_METRICS_FILE, keep=500, flush_interval=PERF_FLUSH_INTERVAL,
+                 max_bytes=PERF_METRICS_MAX_BYTES):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.records = deque(maxlen=keep)
+        self._buffer = []  # records not yet written to the file
+        self._flushed_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        atexit.register(self.flush)
+
+    def add(self, record):
+        with self._lock:
+            self.records.append(record)
+            if not self.path:
+                return
+            self._buffer.append(record)
+            due = time.monotonic() - self._flushed_at >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """Append buffered records to the metrics file now (also done every flush_interval)"""
+        with self._write_lock:
+            with self._lock:
+                records, self._buffer = self._buffer, []
+                self._flushed_at = time.monotonic()
+            if not records:
+                return
+            lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+            try:
+                if os.path.exists(self.path) and os.path.getsize(self.path) + len(lines) > self.max_bytes:
+                    os.replace(self.path, self.path + ".1")
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+            except OSError:
+                pass  # metrics are best effort; the in-memory records still feed the panel
+
+    def recent(self, n=None):
+        with self._lock:
+            records = list(self.records)
+        return records if n is None else records[-n:]
+
+
+def percentile(values, q):
+    """q-th percentile (0-100) with nearest-rank on sorted values"""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = max(0, min(len(values) - 1, int(round(q / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+def summarize(records, by=("scope",)):
+    """{(group..., section): {"count", "p50", "p99"}} for total_ms and every span"""
+    samples = defaultdict(list)
+    for record in records:
+        group = tuple(record.get(key, "") for key in by)
+        samples[group + ("total",)].append(record["total_ms"])
+        for name, ms in record.get("spans", {}).items():
+            samples[group + (name,)].append(ms)
+    return {
+        key: {"count": len(v), "p50": percentile(v, 50), "p99": percentile(v, 99)}
+        for key, v in sorted(samples.items())
+    }
+
+
+def load_records(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def prometheus_text(summary, by=("scope",)):
+    """Render a summary in the Prometheus text exposition format"""
+    lines = [
+        "# HELP memory_game_rerun_ms Script rerun section time in milliseconds",
+        "# TYPE memory_game_rerun_ms summary",
+    ]
+    for key, stats in summary.items():
+        labels = ",".join(f'{name}="{value}"' for name, value in zip(by + ("section",), key))
+        lines.append(f'memory_game_rerun_ms{{{labels},quantile="0.5"}} {stats["p50"]}')
+        lines.append(f'memory_game_rerun_ms{{{labels},quantile="0.99"}} {stats["p99"]}')
+        lines.append(f"memory_game_rerun_ms_count{{{labels}}} {stats['count']}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarize per-rerun timing metrics")
+    parser.add_argument("path", nargs="?", default=PERF_METRICS_FILE)
+    parser.add_argument("--by", nargs="+", default=["scope"], help="record fields to group by")
+    parser.add_argument("--prometheus", action="store_true", help="print Prometheus text format")
+    args = parser.parse_args(argv)
+
+    by = tuple(args.by)
+    records = load_records(args.path)
+    summary = summarize(records, by)
+    if args.prometheus:
+        print(prometheus_text(summary, by), end="")
+        return
+
+    print(f"{len(records)} runs from {args.path}")
+    for key, stats in summary.items():
+        print(f"{' / '.join(map(str, key)):50s} n={stats['count']:6d}  "
+              f"p50={stats['p50']:8.2f}ms  p99={stats['p99']:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,329 +1,319 @@
 import streamlit as st
-import random
+import html
+import math
 import time
-import pandas as pd
 from datetime import datetime, timedelta
-from streamlit_autorefresh import st_autorefresh
-import base64
+from sounds import write_sprite
+from leaderboard_index import LeaderboardIndex
+from leaderboard_store import COLUMNS, LeaderboardStore
+from leaderboard_writer import LeaderboardWriter
+from board_component import memory_board
+from engine import DIFFICULTIES, GAME_OVER, INVALID, MemoryGame
+from movelog import MoveLog, new_log_path
+from rooms import ROOM_LONG_POLL, ROOM_POLL_INTERVAL, RoomStore
+from history import since_days
+from sessions import GameHandle, SessionRegistry, deep_sizeof, new_token, valid_token
+from solver import par
+from stats import LeaderboardStats
+from theme import stylesheet_tag, write_static
+from perf import PerfLog, PerfRecorder, summarize
 
 st.set_page_config(page_title="🃏 Card Memory Game", layout="wide")
 
+# Per-rerun timing: one recorder per script run, one shared log per process
+@st.cache_resource
+def get_perf_log():
+    return PerfLog()
+
+def begin_run(scope, trigger="", **tags):
+    """Start timing a script run; a previous run cut short by st.rerun() is recorded first"""
+    previous = st.session_state.get("perf_run")
+    if previous is not None and not previous.finished:
+        end_run(interrupted=True)
+    st.session_state.perf_game_reruns = st.session_state.get("perf_game_reruns", 0) + 1
+    st.session_state.perf_run = PerfRecorder(scope, trigger, **tags)
+    return st.session_state.perf_run
+
+def end_run(**tags):
+    game = st.session_state.get("game")
+    record = st.session_state.perf_run.finish(
+        moves=game.moves if game else 0,
+        game_reruns=st.session_state.get("perf_game_reruns", 0),
+        **tags,
+    )
+    get_perf_log().add(record)
+
+def perf_lap(name):
+    st.session_state.perf_run.lap(name)
+
+def rerun_fragment():
+    """Rerun only the calling fragment. scope="fragment" raises during a full
+    app run (a fragment's widget handled by one, or AppTest, which only does
+    full runs), so those rerun the app instead"""
+    run = st.session_state.perf_run
+    st.rerun(scope="app" if run.scope == "app" and not run.finished else "fragment")
+
+def set_trigger(trigger):
+    """Widget callback: names the event behind the next full app run in its perf record"""
+    st.session_state.perf_trigger = trigger
+
+def rerun_app(trigger):
+    set_trigger(trigger)
+    st.rerun()
+
+# Widget callbacks run before the script, so the trigger is known here; a
+# run without one is the session's first, or something untagged
+begin_run("app", st.session_state.pop("perf_trigger", "other" if "perf_run" in st.session_state else "session_start"))
+
 # Malaysia Time
 def malaysia_time():
     return datetime.utcnow() + timedelta(hours=8)
 
-# Leaderboard file
+# Leaderboard storage (legacy CSV files are imported once into SQLite)
+LEADERBOARD_DB = "leaderboard.db"
 LEADERBOARD_FILE = "leaderboard.csv"
-
-# Sound effect functions
-def generate_tone(frequency, duration=0.2, sample_rate=22050):
-    """Generate a simple tone for sound effects"""
-    import numpy as np
-    t = np.linspace(0, duration, int(sample_rate * duration))
-    wave = np.sin(2 * np.pi * frequency * t) * 0.3
-    return wave
-
-def create_audio_data(wave, sample_rate=22050):
-    """Convert wave to base64 audio data"""
-    try:
-        import numpy as np
-        import io
-        from scipy.io.wavfile import write
-        
-        # Convert to 16-bit PCM
-        audio_data = (wave * 32767).astype(np.int16)
-        
-        # Create WAV file in memory
-        buffer = io.BytesIO()
-        write(buffer, sample_rate, audio_data)
-        buffer.seek(0)
-        
-        # Convert to base64
-        audio_b64 = base64.b64encode(buffer.read()).decode()
-        return f"data:audio/wav;base64,{audio_b64}"
-    except ImportError:
-        return None
-
-# Load or create leaderboard with caching
-@st.cache_data
-def load_leaderboard():
-    try:
-        return pd.read_csv(LEADERBOARD_FILE)
-    except FileNotFoundError:
-        return pd.DataFrame(columns=["Name", "Difficulty", "Moves", "Date"])
-
-def save_leaderboard(leaderboard):
-    leaderboard.to_csv(LEADERBOARD_FILE, index=False)
-    load_leaderboard.clear()
+LEGACY_LEADERBOARD_FILES = [LEADERBOARD_FILE, "Leaderboard.csv"]
+
+# Sounds ship to the browser as one cached audio sprite; written once per process
+@st.cache_resource
+def publish_sound_sprite():
+    write_sprite()
+
+publish_sound_sprite()
+
+# Leaderboard store is shared by every session in the process
+@st.cache_resource
+def get_leaderboard_store():
+    store = LeaderboardStore(LEADERBOARD_DB)
+    for csv_path in LEGACY_LEADERBOARD_FILES:
+        store.import_csv(csv_path)
+    return store
+
+# In-memory top 10 and personal bests, so reruns don't query the database
+@st.cache_resource
+def get_leaderboard_index():
+    return LeaderboardIndex(get_leaderboard_store(), top_n=10)
+
+# Score submissions are queued and written in batches off the request path
+@st.cache_resource
+def get_leaderboard_writer():
+    return LeaderboardWriter(get_leaderboard_store(), get_leaderboard_index())
+
+# Rank percentiles, histograms and per-player averages, updated as scores commit
+@st.cache_resource
+def get_leaderboard_stats():
+    return LeaderboardStats(get_leaderboard_store())
+
+def clear_leaderboard():
+    get_leaderboard_writer().flush()
+    get_leaderboard_store().replace_all([])
+
+def as_columns(rows, columns):
+    """Row tuples as a column dict for st.dataframe (no pandas needed)"""
+    return {name: [row[i] for row in rows] for i, name in enumerate(columns)}
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes:02d}:{seconds:02d}"
+
+# Seconds a missed pair stays face up before flipping back
+FLIP_BACK_DELAY = 1.5
+
+# Games live in a process-wide registry that caps resident memory; the
+# session keeps a handle whose token is also in the URL, so an evicted game,
+# or one left in a closed tab, is restored when the player comes back
+@st.cache_resource
+def get_session_registry():
+    return SessionRegistry()
+
+def restore_sidebar(game):
+    """Preset the sidebar widgets to match a game restored from a returning player's token"""
+    st.session_state.difficulty = next(
+        (label for label, size in DIFFICULTIES.items() if size == (game.rows, game.cols)), None
+    )
+    if len(game.player_names) == 1:
+        st.session_state.mode = "Solo"
+        st.session_state.solo_name = game.player_names[0]
+    else:
+        st.session_state.mode = "Multiplayer"
+        st.session_state.num_players = len(game.player_names)
+        for i, name in enumerate(game.player_names):
+            st.session_state[f"player_{i}"] = name
+
+if "game_handle" not in st.session_state:
+    token = st.query_params.get("s")
+    if not valid_token(token):
+        token = new_token()
+    st.query_params["s"] = token
+    st.session_state.game_handle = GameHandle(get_session_registry(), token)
+    restored = st.session_state.game_handle.game
+    if restored is not None:
+        restore_sidebar(restored)
 
 # Sidebar inputs
 st.sidebar.title("🧩 Login & Settings")
 
 # Sound settings
-sound_enabled = st.sidebar.checkbox("🔊 Sound Effects", value=True)
+sound_enabled = st.sidebar.checkbox("🔊 Sound Effects", value=True, on_change=set_trigger, args=("sound",))
 
 # Multiplayer or solo
-mode = st.sidebar.radio("Game Mode", ["Solo", "Multiplayer"], horizontal=True)
+mode = st.sidebar.radio("Game Mode", ["Solo", "Multiplayer", "Online room"], horizontal=True, key="mode",
+                        on_change=set_trigger, args=("mode",))
 
 if mode == "Solo":
-    player_names = [st.sidebar.text_input("Your name", key="solo_name")]
+    player_names = [st.sidebar.text_input("Your name", key="solo_name", on_change=set_trigger, args=("name",))]
+elif mode == "Online room":
+    player_names = [st.sidebar.text_input("Your name", key="online_name", on_change=set_trigger, args=("name",))]
 else:
-    num_players = st.sidebar.slider("Number of Players", 2, 4, 2)
+    num_players = st.sidebar.slider("Number of Players", 2, 4, key="num_players", on_change=set_trigger,
+                                    args=("num_players",))
     player_names = []
     for i in range(num_players):
-        player_names.append(st.sidebar.text_input(f"Player {i+1} name", key=f"player_{i}"))
-
-difficulty = st.sidebar.selectbox("Difficulty level", ["Easy (2x2)", "Medium (4x4)", "Hard (6x6)"])
-theme = st.sidebar.radio("🎨 Theme Mode", ["Light", "Dark"], horizontal=True)
-difficulty_map = {"Easy (2x2)": (2, 2), "Medium (4x4)": (4, 4), "Hard (6x6)": (6, 6)}
-rows, cols = difficulty_map[difficulty]
-
-# Enhanced CSS with animations and mobile responsiveness - CONSISTENT CARD SIZES
-css_styles = f"""
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Poppins:wght@400;600;700&display=swap');
-
-body {{
-    font-family: 'Poppins', sans-serif;
-    background: {'linear-gradient(135deg, #0f172a 0%, #1e293b 100%)' if theme == 'Dark' else 'linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%)'};
-}}
-
-[data-testid="stSidebar"] {{
-    background: {'linear-gradient(180deg, #1e293b 0%, #334155 100%) !important' if theme == 'Dark' else 'linear-gradient(180deg, #ffffff 0%, #f1f5f9 100%) !important'};
-    color: {'white' if theme == 'Dark' else 'black'} !important;
-}}
-
-/* Base card styling for ALL cards - consistent sizing */
-.card-button, [data-testid="baseButton-secondary"] {{
-    background: {'linear-gradient(145deg, #1e293b, #334155) !important' if theme == 'Dark' else 'linear-gradient(145deg, #ffffff, #f1f5f9) !important'};
-    color: {'#f1f5f9 !important' if theme == 'Dark' else '#1e293b !important'};
-    border: {'2px solid #475569 !important' if theme == 'Dark' else '2px solid #cbd5e1 !important'};
-    border-radius: 15px !important;
-    font-size: clamp(3rem, 6vw, 6rem) !important;
-    height: clamp(100px, 20vw, 180px) !important;
-    width: 100% !important;
-    margin: 8px !important;
-    transition: all 0.3s cubic-bezier(0.4, 0, 0.2, 1) !important;
-    box-shadow: {'0 6px 20px rgba(0,0,0,0.3) !important' if theme == 'Dark' else '0 6px 20px rgba(0,0,0,0.1) !important'};
-    position: relative !important;
-    overflow: hidden !important;
-    display: flex !important;
-    align-items: center !important;
-    justify-content: center !important;
-    font-weight: 600 !important;
-    font-family: 'Poppins', sans-serif !important;
-    min-height: clamp(100px, 20vw, 180px) !important;
-    max-height: clamp(100px, 20vw, 180px) !important;
-}}
-
-/* Hover effects for all cards */
-.card-button:hover, [data-testid="baseButton-secondary"]:hover:not(:disabled) {{
-    transform: translateY(-5px) scale(1.02) !important;
-    box-shadow: {'0 10px 30px rgba(0,0,0,0.4) !important' if theme == 'Dark' else '0 10px 30px rgba(0,0,0,0.15) !important'};
-}}
-
-/* Active state for all cards */
-.card-button:active, [data-testid="baseButton-secondary"]:active {{
-    transform: translateY(-2px) scale(0.98) !important;
-}}
-
-/* Disabled state styling */
-[data-testid="baseButton-secondary"]:disabled {{
-    opacity: 1 !important;
-    cursor: default !important;
-}}
-
-/* Flip animation */
-.card-flip {{
-    animation: flipCard 0.6s ease-in-out !important;
-    font-size: clamp(3rem, 6vw, 6rem) !important;
-    height: clamp(100px, 20vw, 180px) !important;
-}}
-
-@keyframes flipCard {{
-    0% {{ transform: rotateY(0deg) scale(1); }}
-    50% {{ transform: rotateY(90deg) scale(1.1); }}
-    100% {{ transform: rotateY(0deg) scale(1); }}
-}}
-
-/* Match animation */
-.card-match {{
-    animation: matchPulse 0.8s ease-in-out !important;
-    background: linear-gradient(145deg, #10b981, #059669) !important;
-    color: white !important;
-    font-size: clamp(3rem, 6vw, 6rem) !important;
-    height: clamp(100px, 20vw, 180px) !important;
-}}
-
-@keyframes matchPulse {{
-    0%, 100% {{ transform: scale(1); }}
-    50% {{ transform: scale(1.1); box-shadow: 0 0 25px rgba(16, 185, 129, 0.6); }}
-}}
-
-/* Unflipped card specific styling */
-.card-unflipped {{
-    background: {'linear-gradient(145deg, #374151, #4b5563) !important' if theme == 'Dark' else 'linear-gradient(145deg, #e5e7eb, #d1d5db) !important'};
-    color: {'#9ca3af !important' if theme == 'Dark' else '#6b7280 !important'};
-    border: {'2px solid #6b7280 !important' if theme == 'Dark' else '2px solid #9ca3af !important'};
-}}
-
-.card-unflipped:hover:not(:disabled) {{
-    background: {'linear-gradient(145deg, #4b5563, #6b7280) !important' if theme == 'Dark' else 'linear-gradient(145deg, #d1d5db, #b5b5b5) !important'};
-    transform: translateY(-5px) scale(1.02) !important;
-    box-shadow: {'0 10px 30px rgba(0,0,0,0.4) !important' if theme == 'Dark' else '0 10px 30px rgba(0,0,0,0.15) !important'};
-}}
-
-.progress-container {{
-    width: 100%;
-    height: 20px;
-    background: {'rgba(51, 65, 85, 0.3)' if theme == 'Dark' else 'rgba(203, 213, 225, 0.5)'};
-    border-radius: 10px;
-    overflow: hidden;
-    margin: 10px 0;
-    box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
-}}
-
-.progress-bar {{
-    height: 100%;
-    background: linear-gradient(90deg, #3b82f6, #1d4ed8);
-    border-radius: 10px;
-    transition: width 0.5s ease-in-out;
-    position: relative;
-    overflow: hidden;
-}}
-
-.progress-bar::after {{
-    content: '';
-    position: absolute;
-    top: 0;
-    left: -100%;
-    width: 100%;
-    height: 100%;
-    background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
-    animation: shimmer 2s infinite;
-}}
-
-@keyframes shimmer {{
-    0% {{ left: -100%; }}
-    100% {{ left: 100%; }}
-}}
-
-.stats-card {{
-    background: {'rgba(30, 41, 59, 0.8)' if theme == 'Dark' else 'rgba(255, 255, 255, 0.8)'};
-    backdrop-filter: blur(10px);
-    border-radius: 15px;
-    padding: 20px;
-    margin: 10px 0;
-    border: {'1px solid rgba(71, 85, 105, 0.3)' if theme == 'Dark' else '1px solid rgba(203, 213, 225, 0.3)'};
-    box-shadow: {'0 8px 32px rgba(0,0,0,0.3)' if theme == 'Dark' else '0 8px 32px rgba(0,0,0,0.1)'};
-}}
-
-/* Mobile responsiveness - maintaining consistent larger sizes */
-@media (max-width: 768px) {{
-    .card-button, [data-testid="baseButton-secondary"], .card-flip, .card-match {{
-        font-size: clamp(2.5rem, 8vw, 4rem) !important;
-        height: clamp(80px, 20vw, 120px) !important;
-        min-height: clamp(80px, 20vw, 120px) !important;
-        max-height: clamp(80px, 20vw, 120px) !important;
-        margin: 6px !important;
-    }}
-    
-    .stats-card {{
-        padding: 15px;
-        margin: 5px 0;
-    }}
-}}
-
-@media (max-width: 480px) {{
-    .card-button, [data-testid="baseButton-secondary"], .card-flip, .card-match {{
-        font-size: clamp(2rem, 10vw, 3rem) !important;
-        height: clamp(70px, 22vw, 100px) !important;
-        min-height: clamp(70px, 22vw, 100px) !important;
-        max-height: clamp(70px, 22vw, 100px) !important;
-        margin: 4px !important;
-    }}
-}}
-
-/* Hide default button focus outline */
-[data-testid="baseButton-secondary"]:focus {{
-    outline: none !important;
-    box-shadow: {'0 6px 20px rgba(0,0,0,0.3) !important' if theme == 'Dark' else '0 6px 20px rgba(0,0,0,0.1) !important'};
-}}
-</style>
-"""
-
-st.markdown(css_styles, unsafe_allow_html=True)
-
-EMOJIS = ['🐶','🐱','🐭','🦊','🐻','🐼','🐨','🐯','🐸','🐵','🐔','🐧','🐴','🦄','🐝','🐢','🐙','🦋']
-
-def init_game(rows, cols, player_names):
-    num_pairs = (rows * cols) // 2
-    deck = EMOJIS[:num_pairs] * 2
-    random.shuffle(deck)
-    return {
-        "deck": deck,
-        "flipped": [False] * (rows * cols),
-        "matched": [False] * (rows * cols),
-        "first_choice": None,
-        "second_choice": None,
-        "moves": 0,
-        "score": 0,
-        "waiting": False,
-        "wait_start": None,
-        "start_time": None,
-        "rows": rows,
-        "cols": cols,
-        "num_pairs": num_pairs,
-        "game_over": False,
-        "mode": mode,
-        "player_names": player_names,
-        "current_player": 0,
-        "player_scores": [0]*len(player_names),
-        "score_submitted": False,
-        "last_match": False,
-        "game_just_completed": False,
-    }
-
-def game_params_changed(game, rows, cols, player_names, mode):
-    return (game.get("rows") != rows or
-            game.get("cols") != cols or
-            game.get("player_names") != player_names or
-            game.get("mode") != mode)
-
-# Initialize game state
-if "game" not in st.session_state:
-    st.session_state.game = init_game(rows, cols, player_names)
-
-game = st.session_state.game
+        player_names.append(st.sidebar.text_input(f"Player {i+1} name", key=f"player_{i}", on_change=set_trigger,
+                                                  args=("name",)))
+
+difficulty = st.sidebar.selectbox("Difficulty level", list(DIFFICULTIES), key="difficulty", on_change=set_trigger,
+                                  args=("difficulty",))
+theme = st.sidebar.radio("🎨 Theme Mode", ["Light", "Dark"], horizontal=True, on_change=set_trigger, args=("theme",))
+flip_back_delay = st.sidebar.slider("⏱️ Flip-back delay (s)", 0.5, 3.0, FLIP_BACK_DELAY, 0.25, on_change=set_trigger,
+                                    args=("flip_back_delay",))
+rows, cols = DIFFICULTIES[difficulty]
+show_perf = st.sidebar.checkbox("📈 Perf panel", value=False, on_change=set_trigger, args=("perf_panel",))
+
+# Online rooms are shared by every session in the process
+@st.cache_resource
+def get_room_store():
+    return RoomStore()
+
+def current_room():
+    return get_room_store().get(st.session_state.get("room_code"))
+
+def room_controls():
+    """Sidebar controls to create, join or leave an online room"""
+    store = get_room_store()
+    name = player_names[0].strip()
+    room = current_room()
+    if room is not None:
+        players = [name + (" (left)" if i in room.left else "") for i, name in enumerate(room.game.player_names)]
+        st.sidebar.success(f"Room **{room.code}**: {', '.join(players)}")
+        if st.sidebar.button("🚪 Leave room", on_click=set_trigger, args=("leave_room",)):
+            store.leave(room, st.session_state.room_player)
+            del st.session_state.room_code
+            rerun_app("leave_room")
+        return
+    code = st.sidebar.text_input("Room code", key="room_code_input", on_change=set_trigger, args=("room_code",))
+    create_col, join_col = st.sidebar.columns(2)
+    if create_col.button("Create room", disabled=not name, on_click=set_trigger, args=("create_room",)):
+        room = store.create(rows, cols, name, flip_back_delay)
+        st.session_state.room_code, st.session_state.room_player = room.code, 0
+        rerun_app("create_room")
+    if join_col.button("Join room", disabled=not (name and code), on_click=set_trigger, args=("join_room",)):
+        try:
+            room, st.session_state.room_player = store.join(code, name)
+        except (KeyError, ValueError) as e:
+            st.sidebar.error(f"Can't join: {e.args[0]}")
+        else:
+            st.session_state.room_code = room.code
+            rerun_app("join_room")
+
+if mode == "Online room":
+    room_controls()
+st.session_state.perf_run.tags.update(difficulty=difficulty, mode=mode)
+perf_lap("sidebar")
+
+# Page CSS; card styling and animations live in frontend/board/index.html
+# The stylesheets are written to static/ once per process; each full rerun
+# only re-sends a short @import (an element that isn't re-sent is dropped)
+@st.cache_resource
+def publish_stylesheets():
+    write_static()
+
+publish_stylesheets()
+st.markdown(stylesheet_tag(theme), unsafe_allow_html=True)
+perf_lap("css")
+
+def new_game(rows, cols, player_names):
+    """Start a fresh engine game and reset this session's view flags"""
+    game = MemoryGame(rows, cols, player_names)
+    st.session_state.game_handle.game = game
+    st.session_state.move_log = MoveLog(new_log_path(), game)
+    st.session_state.wait_until = None
+    st.session_state.score_submitted = False
+    st.session_state.game_just_completed = False
+    st.session_state.perf_game_reruns = 0
+    return game
+
+def apply_flips(game, flips):
+    """Replay a burst of board clicks on the engine, which stays authoritative"""
+    move_log = st.session_state.move_log
+    outcomes = []
+    for cell in flips:
+        result = game.apply_flip(cell)
+        if result.outcome == INVALID:
+            break  # later clicks were made on top of this one
+        if move_log is not None:
+            move_log.record(cell, result.player)
+        outcomes.append(result.outcome)
+    if move_log is not None:
+        move_log.flush()
+    if not outcomes:
+        return
+
+    if game.waiting:
+        # No match - start waiting
+        st.session_state.wait_until = time.time() + flip_back_delay
+    else:
+        st.session_state.wait_until = None
+    if GAME_OVER in outcomes:
+        st.session_state.game_just_completed = True
+
+def resolve_miss(game):
+    """Flip a missed pair back and pass the turn"""
+    game.resolve_miss()
+    st.session_state.wait_until = None
+
+def game_params_changed(game, rows, cols, player_names):
+    return (game.rows != rows or
+            game.cols != cols or
+            game.player_names != player_names)
+
+# Initialize game state, or pick up a restored one
+game = st.session_state.game_handle.game
+if game is None:
+    game = new_game(rows, cols, player_names)
+elif "move_log" not in st.session_state:
+    # Restored into a fresh session: flip a pending miss back and keep playing.
+    # Not logged: a move log replays from a fresh deal and this game is mid-way
+    st.session_state.move_log = None
+    st.session_state.wait_until = time.time()
+    st.session_state.score_submitted = game.game_over
+    st.session_state.game_just_completed = False
+    st.session_state.perf_game_reruns = 0
 
 # Only reinitialize if parameters actually changed
-if game_params_changed(game, rows, cols, player_names, mode):
-    st.session_state.game = init_game(rows, cols, player_names)
-    game = st.session_state.game
+if game_params_changed(game, rows, cols, player_names):
+    game = new_game(rows, cols, player_names)
 
-# Create containers for dynamic content
-header_container = st.container()
-progress_container = st.container()
-game_board_container = st.container()
-status_container = st.container()
-sound_container = st.container()
+# The token moves if this URL was opened in another tab, which took the game over
+if st.query_params.get("s") != st.session_state.game_handle.token:
+    st.query_params["s"] = st.session_state.game_handle.token
 
-# Reset submit flag if new game started
-if game["moves"] == 0 and game.get("score_submitted", False):
-    game["score_submitted"] = False
+# Create containers for content that only changes on a full app rerun
+header_container = st.container()
 
 # Handle clear leaderboard
-if st.sidebar.button("🗑️ Clear Leaderboard"):
-    empty_leaderboard = pd.DataFrame(columns=["Name", "Difficulty", "Moves", "Date"])
-    save_leaderboard(empty_leaderboard)
-    st.session_state.game = init_game(rows, cols, player_names)
+if st.sidebar.button("🗑️ Clear Leaderboard", on_click=set_trigger, args=("clear_leaderboard",)):
+    clear_leaderboard()
+    new_game(rows, cols, player_names)
     st.sidebar.success("Leaderboard cleared and game restarted!")
-    st.rerun()
+    rerun_app("clear_leaderboard")
 
 # Header
 with header_container:
     if mode == "Solo":
         st.markdown(f"# 🃏 Memory Game - Hello, **{player_names[0] if player_names[0] else 'Player'}**!")
+    elif mode == "Online room":
+        st.markdown("# 🃏 Memory Game - Online Room")
     else:
         st.markdown(f"# 🃏 Memory Game - Multiplayer Mode")
     
@@ -346,254 +336,420 @@ with header_container:
         - The player with the **most matched pairs wins**!
         """)
 
-# Progress bar and stats
-with progress_container:
-    progress_percentage = (game["score"] / game["num_pairs"]) * 100 if game["num_pairs"] > 0 else 0
-    
+        st.markdown("### 🌐 Online Room Rules")
+        st.markdown("""
+        - One player creates a room and shares its code; others join from their own device.
+        - Players can join until the first card is flipped.
+        - Multiplayer rules apply, and every board updates as soon as a move is made.
+        """)
+perf_lap("header")
+
+# The board, progress bar and status run as one fragment: a card click only
+# reruns this function, not the sidebar, CSS, rules or leaderboard
+@st.fragment
+def game_view():
+    # During a full app run the fragment is timed as part of it; a
+    # fragment-only rerun gets a record of its own
+    fragment_run = st.session_state.perf_run.finished
+    if fragment_run:
+        begin_run("fragment", difficulty=difficulty, mode=mode)
+    try:
+        render_game()
+    finally:
+        if fragment_run:
+            end_run()
+
+def take_board_event(key, game):
+    """The board component's value if it is an event this session hasn't handled yet.
+
+    Returns (event, stale): stale events were made on a board that has changed
+    since (the version they carry is not the game's), so they are dropped.
+    """
+    event = st.session_state.get(key)
+    if not event or event.get("id") == st.session_state.get("board_event_id"):
+        return None, False
+    st.session_state.board_event_id = event["id"]
+    if not game.is_current(event.get("version")):
+        return None, True
+    return event, False
+
+def render_progress(game):
+    """Progress bar and move/score line"""
+    progress_percentage = (game.score / game.num_pairs) * 100 if game.num_pairs > 0 else 0
+
     st.markdown(f'<div class="stats-card">', unsafe_allow_html=True)
     st.markdown(f"### Difficulty: **{difficulty}**")
-    
+
     # Progress bar
     st.markdown(f"""
     <div class="progress-container">
         <div class="progress-bar" style="width: {progress_percentage}%"></div>
     </div>
     <div style="text-align: center; margin-top: 5px; font-weight: 600;">
-        Progress: {game["score"]}/{game["num_pairs"]} pairs ({progress_percentage:.1f}%)
+        Progress: {game.score}/{game.num_pairs} pairs ({progress_percentage:.1f}%)
     </div>
     """, unsafe_allow_html=True)
-    
+
     if mode == "Solo":
         st.markdown(f"""
         <div style="display: flex; justify-content: space-around; margin-top: 15px; font-weight: 600;">
-            <div>🎯 Moves: {game["moves"]}</div>
-            <div>✅ Matches: {game["score"]}/{game["num_pairs"]}</div>
+            <div>🎯 Moves: {game.moves}</div>
+            <div>✅ Matches: {game.score}/{game.num_pairs}</div>
         </div>
         """, unsafe_allow_html=True)
     else:
+        # Player names are user input: escape them, this markdown allows raw HTML
+        names = [html.escape(name) for name in game.player_names]
         scores_str = " | ".join(
-            f"**{name}**: {score}" for name, score in zip(game["player_names"], game["player_scores"])
+            f"**{name}**: {score}" for name, score in zip(names, game.player_scores)
         )
         st.markdown(f"""
         <div style="margin-top: 15px;">
             <div style="font-weight: 600; margin-bottom: 10px;">
-                🎯 Moves: {game["moves"]} | Current Player: **{game["player_names"][game["current_player"]]}**
+                🎯 Moves: {game.moves} | Current Player: **{names[game.current_player]}**
             </div>
             <div style="font-weight: 600;">Scores: {scores_str}</div>
         </div>
         """, unsafe_allow_html=True)
-    
+
     st.markdown('</div>', unsafe_allow_html=True)
 
-# Personal best display (cached)
-if mode == "Solo" and player_names[0]:
-    leaderboard = load_leaderboard()
-    personal_best = leaderboard[(leaderboard["Name"] == player_names[0]) & (leaderboard["Difficulty"] == difficulty)]
-    if not personal_best.empty:
-        best = personal_best.sort_values(by=["Moves", "Date"]).iloc[0]
-        st.info(f"🏅 **Your Best:** {best['Moves']} moves on {best['Date']}")
-
-# Handle waiting state with reduced reruns
-should_rerun = False
-if game["waiting"]:
-    st_autorefresh(interval=1000, limit=3, key="auto_refresh")
-    if time.time() - game["wait_start"] > 1.5:  # Slightly longer wait for better UX
-        f, s = game["first_choice"], game["second_choice"]
-        game["flipped"][f] = False
-        game["flipped"][s] = False
-        game["first_choice"] = game["second_choice"] = None
-        game["waiting"] = False
-        game["wait_start"] = None
-        game["last_match"] = False
-        if mode == "Multiplayer":
-            game["current_player"] = (game["current_player"] + 1) % len(game["player_names"])
-        should_rerun = True
-
-# Game board with enhanced styling - FIXED CARD SIZING
-with game_board_container:
-    cols_streamlit = st.columns(game["cols"])
-    
-    for i in range(rows * cols):
-        with cols_streamlit[i % cols]:
-            if game["matched"][i]:
-                # Matched card - show with match styling
-                st.markdown(f'<div class="card-button card-match">{game["deck"][i]}</div>', 
-                          unsafe_allow_html=True)
-                st.button("", key=f"card_{i}", disabled=True, 
-                         help=f"Matched card {i+1}: {game['deck'][i]}")
-            elif game["flipped"][i]:
-                # Flipped card - show with flip animation
-                st.markdown(f'<div class="card-button card-flip">{game["deck"][i]}</div>', 
-                          unsafe_allow_html=True)
-                st.button("", key=f"card_{i}", disabled=True, 
-                         help=f"Flipped card {i+1}: {game['deck'][i]}")
+def render_game():
+    game = st.session_state.game_handle.game
+
+    # Containers for the fragment's dynamic content
+    progress_container = st.container()
+    game_board_container = st.container()
+    status_container = st.container()
+
+    # Board event: a completed pair or the browser's one-shot flip-back timer.
+    # Handled before rendering so the board, progress and status reflect it
+    # in this same run
+    event, stale = take_board_event("board", game)
+    new_event = event is not None
+
+    # Flip a missed pair back at its deadline, or as soon as the next click arrives
+    if game.waiting and (new_event or time.time() >= st.session_state.wait_until):
+        resolve_miss(game)
+
+    if new_event and event.get("flips"):
+        apply_flips(game, event["flips"])
+    if (new_event or stale) and st.session_state.perf_run.scope == "fragment":
+        st.session_state.perf_run.trigger = "stale" if stale else "flips" if event.get("flips") else "expire"
+    perf_lap("events")
+
+    # Progress bar and stats
+    with progress_container:
+        render_progress(game)
+    perf_lap("progress")
+
+    # Whole board rendered client-side in a single component
+    with game_board_container:
+        memory_board(
+            game,
+            wait_seconds=st.session_state.wait_until - time.time() if game.waiting else None,
+            locked=game.game_over, theme=theme, sound=sound_enabled,
+            ack=st.session_state.get("board_event_id"), key="board",
+        )
+    perf_lap("board")
+
+    # Status messages and game completion
+    with status_container:
+        if game.game_over:
+            winner_text = ""
+            if mode == "Solo":
+                winner_text = f"🎉 Congratulations **{player_names[0] if player_names[0] else 'Player'}**, you finished the game in {game.moves} moves!"
             else:
-                # Unflipped card - use consistent styling
-                if not game["waiting"]:
-                    # Add custom CSS class to unflipped cards for consistent styling
-                    button_html = f'<div class="card-button card-unflipped">❓</div>'
-                    st.markdown(button_html, unsafe_allow_html=True)
-                    
-                    if st.button("", key=f"card_{i}", help=f"Click to reveal card {i+1}"):
-                        # Process card click
-                        game["flipped"][i] = True
-                        if game["start_time"] is None:
-                            game["start_time"] = time.time()
-                        
-                        if game["first_choice"] is None:
-                            game["first_choice"] = i
-                            # Sound for first card flip
-                            if sound_enabled:
-                                match_sound = generate_tone(440, 0.1)  # A4 note
-                                if match_sound is not None:
-                                    audio_data = create_audio_data(match_sound)
-                                    if audio_data:
-                                        with sound_container:
-                                            st.markdown(f'<audio autoplay><source src="{audio_data}" type="audio/wav"></audio>', 
-                                                      unsafe_allow_html=True)
-                        else:
-                            game["second_choice"] = i
-                            game["moves"] += 1
-                            f, s = game["first_choice"], game["second_choice"]
-                            
-                            if game["deck"][f] == game["deck"][s]:
-                                # Match found
-                                game["matched"][f] = game["matched"][s] = True
-                                game["score"] += 1
-                                game["last_match"] = True
-                                if mode == "Multiplayer":
-                                    game["player_scores"][game["current_player"]] += 1
-                                game["first_choice"] = game["second_choice"] = None
-                                
-                                # Match sound
-                                if sound_enabled:
-                                    match_sound = generate_tone(660, 0.3)  # E5 note
-                                    if match_sound is not None:
-                                        audio_data = create_audio_data(match_sound)
-                                        if audio_data:
-                                            with sound_container:
-                                                st.markdown(f'<audio autoplay><source src="{audio_data}" type="audio/wav"></source></audio>', 
-                                                          unsafe_allow_html=True)
-                                
-                                # Check for game over
-                                if game["score"] == game["num_pairs"]:
-                                    game["game_over"] = True
-                                    game["game_just_completed"] = True
-                                    # Victory sound
-                                    if sound_enabled:
-                                        victory_sound = generate_tone(880, 0.5)  # A5 note
-                                        if victory_sound is not None:
-                                            audio_data = create_audio_data(victory_sound)
-                                            if audio_data:
-                                                with sound_container:
-                                                    st.markdown(f'<audio autoplay><source src="{audio_data}" type="audio/wav"></audio>', 
-                                                              unsafe_allow_html=True)
-                            else:
-                                # No match - start waiting
-                                game["waiting"] = True
-                                game["wait_start"] = time.time()
-                                game["last_match"] = False
-                                # Miss sound
-                                if sound_enabled:
-                                    miss_sound = generate_tone(220, 0.2)  # A3 note
-                                    if miss_sound is not None:
-                                        audio_data = create_audio_data(miss_sound)
-                                        if audio_data:
-                                            with sound_container:
-                                                st.markdown(f'<audio autoplay><source src="{audio_data}" type="audio/wav"></audio>', 
-                                                          unsafe_allow_html=True)
-                        
-                        should_rerun = True
+                max_score = max(game.player_scores)
+                winners = [game.player_names[i] for i, sc in enumerate(game.player_scores) if sc == max_score]
+                if len(winners) == 1:
+                    winner_text = f"🎉 Congratulations **{winners[0]}**, you won with {max_score} pairs!"
                 else:
-                    # Waiting state - show disabled card with consistent styling
-                    st.markdown(f'<div class="card-button card-unflipped">❓</div>', 
-                              unsafe_allow_html=True)
-                    st.button("", key=f"card_{i}", disabled=True, 
-                             help="Wait for cards to flip back")
-
-# Status messages and game completion
-with status_container:
-    if game.get("game_over", False):
-        if game.get("game_just_completed", False):
-            st.balloons()
-            game["game_just_completed"] = False  # Reset flag
+                    winner_text = f"🎉 It's a tie between {', '.join(winners)} with {max_score} pairs!"
         
-        winner_text = ""
-        if mode == "Solo":
-            winner_text = f"🎉 Congratulations **{player_names[0] if player_names[0] else 'Player'}**, you finished the game in {game['moves']} moves!"
-        else:
-            max_score = max(game["player_scores"])
-            winners = [game["player_names"][i] for i, sc in enumerate(game["player_scores"]) if sc == max_score]
-            if len(winners) == 1:
-                winner_text = f"🎉 Congratulations **{winners[0]}**, you won with {max_score} pairs!"
-            else:
-                winner_text = f"🎉 It's a tie between {', '.join(winners)} with {max_score} pairs!"
-        
-        st.success(winner_text)
+            st.success(winner_text)
         
-        # Calculate efficiency
-        optimal_moves = game["num_pairs"]
-        efficiency = (optimal_moves / game["moves"]) * 100 if game["moves"] > 0 else 0
-        efficiency_text = "Perfect!" if efficiency == 100 else f"{efficiency:.1f}%"
+            # Efficiency against the expected moves of a perfect-memory player
+            expected_moves = par(game.num_pairs)
+            efficiency = (expected_moves / game.moves) * 100 if game.moves > 0 else 0
+            efficiency_text = f"{efficiency:.1f}%"
         
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("Total Moves", game["moves"])
-        with col2:
-            st.metric("Efficiency", efficiency_text)
-        with col3:
-            if game.get("start_time"):
-                duration = time.time() - game["start_time"]
-                st.metric("Time", f"{duration:.1f}s")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("Total Moves", game.moves)
+            with col2:
+                st.metric("Efficiency", efficiency_text,
+                          help=f"Perfect memory takes {expected_moves:.1f} moves on average on this board")
+            with col3:
+                if game.start_time:
+                    duration = game.end_time - game.start_time
+                    st.metric("Time", f"{duration:.1f}s")
         
-        # Auto-submit score for solo mode
-        if mode == "Solo" and not game.get("score_submitted", False):
-            name = player_names[0].strip()
-            if name == "":
-                st.warning("Please enter your name in the sidebar to submit your score.")
-            else:
-                leaderboard = load_leaderboard()
-                now_str = malaysia_time().strftime("%Y-%m-%d %H:%M:%S")
-                new_row = pd.DataFrame([{
-                    "Name": name,
-                    "Difficulty": difficulty,
-                    "Moves": game["moves"],
-                    "Date": now_str,
-                }])
-                leaderboard = pd.concat([leaderboard, new_row], ignore_index=True)
-                save_leaderboard(leaderboard)
-                st.success(f"Score submitted for **{name}**!")
-                game["score_submitted"] = True
+            # Auto-submit score for solo mode
+            if mode == "Solo" and not st.session_state.score_submitted:
+                name = player_names[0].strip()
+                if name == "":
+                    st.warning("Please enter your name in the sidebar to submit your score.")
+                else:
+                    now_str = malaysia_time().strftime("%Y-%m-%d %H:%M:%S")
+                    duration = game.end_time - game.start_time if game.start_time else 0
+                    get_leaderboard_writer().submit(
+                        name, difficulty, game.moves, format_duration(duration), now_str
+                    )
+                    st.session_state.score_submitted = True
+                    # Full app rerun so the leaderboard and personal best pick up the new score
+                    rerun_app("score_submitted")
+            elif mode == "Solo" and st.session_state.game_just_completed:
+                st.success(f"Score submitted for **{player_names[0].strip()}**!")
+
+            if st.session_state.game_just_completed:
+                st.balloons()
+                st.session_state.game_just_completed = False  # Reset flag
     
-    elif game["waiting"]:
-        st.info("🤔 Cards will flip back in a moment...")
-    elif game["last_match"]:
-        st.success("🎯 Great match! Keep going!")
-
-if mode == "Solo" and game.get("score_submitted", False) and not game.get("game_just_completed", False):
-    st.info("Score submitted! Start a new game to submit another score.")
-
-# New game button
-if st.button("🔄 New Game"):
-    st.session_state.game = init_game(rows, cols, player_names)
-    should_rerun = True
+        elif game.waiting:
+            st.info("🤔 Cards will flip back in a moment...")
+        elif game.last_match:
+            st.success("🎯 Great match! Keep going!")
+
+    if mode == "Solo" and st.session_state.score_submitted and not st.session_state.game_just_completed:
+        st.info("Score submitted! Start a new game to submit another score.")
+
+    perf_lap("status")
+
+    # New game button (reruns only the board fragment)
+    if st.button("🔄 New Game"):
+        new_game(rows, cols, player_names)
+        st.session_state.perf_run.trigger = "new_game"
+        rerun_fragment()
+
+# Online rooms rerun their fragment on a short timer (ROOM_POLL_INTERVAL), and
+# each run first waits on the room's condition for up to ROOM_LONG_POLL: a
+# flip landing during the wait wakes it right away, one landing between runs
+# is picked up on the next tick. The timer is set by the full app run, and
+# only while the room is live (a game on, another player seated); a lobby or a
+# finished game refreshes when this session acts or asks to
+ROOM_WAIT_SLICE = 0.1      # heartbeat, so this session's own clicks preempt the wait
+
+def room_view():
+    fragment_run = st.session_state.perf_run.finished
+    if fragment_run:
+        begin_run("room", difficulty=difficulty, mode=mode)
+    try:
+        render_room(fragment_run)
+    finally:
+        if fragment_run:
+            end_run()
+
+def render_room(fragment_run):
+    store = get_room_store()
+    room = current_room()
+    if room is None:
+        st.warning("This room has closed. Create or join another one in the sidebar.")
+        return
+    me = st.session_state.room_player
+
+    progress_container = st.container()
+    game_board_container = st.container()
+    status_container = st.container()
+    heartbeat = st.empty()
+
+    event, stale = take_board_event("room_board", room.game)
+    if event and event.get("flips"):
+        # This browser already played the sounds for its own clicks
+        if store.apply_flips(room, me, event["flips"], event["version"]):
+            st.session_state.room_own_version = room.version
+    elif fragment_run and event is None and not stale:
+        # Nothing from this browser: wait for another player's move
+        seen = st.session_state.get("room_version")
+        deadline = time.monotonic() + ROOM_LONG_POLL
+        while store.wait(room, seen, ROOM_WAIT_SLICE) == seen and time.monotonic() < deadline:
+            heartbeat.empty()  # gives Streamlit a point to stop this run for the user's own input
+    store.resolve_due(room)
+    perf_lap("events")
+
+    with room.lock:
+        game = room.game
+        st.session_state.room_version = room.version
+        wait_seconds = room.wait_until - time.monotonic() if game.waiting else None
+        next_player = room.turn()
+        live = room.live()
+        # Sprite slots for what another player just did; the browser plays them once per version
+        sounds = []
+        if room.version != st.session_state.get("room_own_version"):
+            if game.game_over:
+                sounds = ["victory"]
+            elif game.waiting:
+                sounds = ["miss"]
+            elif game.last_match:
+                sounds = ["match"]
+
+        with progress_container:
+            st.markdown(f"#### 🌐 Room `{room.code}`: you are **{game.player_names[me]}**")
+            render_progress(game)
+        with game_board_container:
+            memory_board(
+                game, wait_seconds=wait_seconds, locked=game.game_over or next_player != me,
+                theme=theme, sound=sound_enabled, ack=st.session_state.get("board_event_id"),
+                lock_on_miss=True, sound_event={"id": room.version, "names": sounds}, key="room_board",
+            )
+        with status_container:
+            if game.game_over:
+                best = max(game.player_scores)
+                winners = [name for name, score in zip(game.player_names, game.player_scores) if score == best]
+                st.success(f"🎉 {' & '.join(winners)} won with {best} pairs!")
+            elif len(game.player_names) == 1:
+                st.info(f"Share the room code **{room.code}** so others can join before the first flip, "
+                        "then refresh to see them.")
+            elif next_player == me:
+                st.success("🎯 Your turn!")
+            else:
+                st.info(f"⏳ Waiting for **{game.player_names[next_player]}**...")
+    perf_lap("board")
+
+    if live != st.session_state.get("room_polling"):
+        # The room started or stopped being live: a full run sets the timer again
+        rerun_app("room_live" if live else "room_idle")
+    if not live:
+        new_col, refresh_col = st.columns(2)
+        if game.game_over and new_col.button("🔄 New Game", key="room_new_game"):
+            store.restart(room)
+            rerun_app("room_new_game")
+        if refresh_col.button("🔃 Refresh", key="room_refresh"):
+            rerun_app("room_refresh")
+
+if mode == "Online room":
+    room = current_room()
+    if room is None:
+        st.info("🌐 Enter your name, then create a room or join one with its code in the sidebar.")
+    else:
+        with room.lock:
+            st.session_state.room_polling = room.live()
+        st.fragment(room_view, run_every=ROOM_POLL_INTERVAL if st.session_state.room_polling else None)()
+else:
+    game_view()
 
-# Single strategic rerun
-if should_rerun:
-    st.rerun()
+# Personal best display (cached)
+if mode == "Solo" and player_names[0]:
+    best = get_leaderboard_writer().personal_best(player_names[0], difficulty)
+    if best is not None:
+        st.info(f"🏅 **Your Best:** {best[2]} moves on {best[4]}")
+        share = get_leaderboard_stats().rank(difficulty, best[2])
+        if share is not None:
+            st.caption(f"📊 Your rank: top {max(1, math.ceil(share * 100))}% of {difficulty} games")
+perf_lap("personal_best")
 
 # Leaderboard display (cached)
 st.markdown("---")
 st.header("🏅 Leaderboard")
 
-leaderboard = load_leaderboard()
-filtered_board = leaderboard[leaderboard["Difficulty"] == difficulty]
-if filtered_board.empty:
-    st.info("No leaderboard entries yet. Be the first!")
-else:
-    sorted_leaderboard = filtered_board.sort_values(by=["Moves", "Date"]).head(10).reset_index(drop=True)
-    sorted_leaderboard.index += 1  # Start ranking from 1
-    st.dataframe(sorted_leaderboard, use_container_width=True)
+top_tab, stats_tab = st.tabs(["🏆 Top 10", "📊 Stats"])
+with top_tab:
+    top_scores = get_leaderboard_writer().top_scores(difficulty, limit=10)
+    if not top_scores:
+        st.info("No leaderboard entries yet. Be the first!")
+    else:
+        sorted_leaderboard = {"Rank": list(range(1, len(top_scores) + 1))}  # Start ranking from 1
+        sorted_leaderboard.update(as_columns(top_scores, COLUMNS))
+        # Moves against the perfect-memory expectation for this board
+        board_par = par((rows * cols) // 2)
+        sorted_leaderboard["vs Par"] = [f"{moves - board_par:+.1f}" for moves in sorted_leaderboard["Moves"]]
+        st.dataframe(sorted_leaderboard, hide_index=True, use_container_width=True)
+
+# Served from the streaming stats, not a scan of the scores table
+with stats_tab:
+    summary = get_leaderboard_stats().summary(difficulty)
+    if summary is None:
+        st.info("No games recorded on this difficulty yet.")
+    else:
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Games", f"{summary['games']:,}")
+        col2.metric("Median moves", summary["median"])
+        col3.metric("Average moves", f"{summary['mean_moves']:.1f}")
+        col4.metric("Average time", format_duration(summary["mean_seconds"]) if summary["mean_seconds"] else "--")
+        st.caption(f"Best {summary['best']} moves · middle half {summary['p25']}–{summary['p75']} moves")
+        moves, games = zip(*summary["histogram"])
+        st.bar_chart({"Moves": moves, "Games": games}, x="Moves", y="Games")
+        if mode == "Solo" and player_names[0]:
+            mine = get_leaderboard_stats().player(player_names[0], difficulty)
+            if mine is not None:
+                average_time = format_duration(mine["mean_seconds"]) if mine["mean_seconds"] else "--"
+                st.caption(
+                    f"**{player_names[0]}**: {mine['games']} games, best {mine['best']}, "
+                    f"average {mine['mean_moves']:.1f} moves in {average_time}"
+                )
+
+# Full history search; paging only reruns this fragment
+HISTORY_PAGE_SIZE = 25
+
+@st.fragment
+def history_view():
+    with st.expander("🔎 Search all scores", expanded=False):
+        scope = st.radio("Show", ["All-time", "This week", "Player"], horizontal=True, key="history_scope")
+        name = st.text_input("Player name", key="history_player") if scope == "Player" else None
+        since = since_days(7, malaysia_time()) if scope == "This week" else None
+        # Keyset paging: each page starts after the last (moves, date, id) of the
+        # one before, so deep pages cost the same as the first
+        query = (difficulty, scope, name)
+        if st.session_state.get("history_query") != query:
+            st.session_state.history_query = query
+            st.session_state.history_cursors = [None]  # `after` for each page visited so far
+        cursors = st.session_state.history_cursors
+        # One extra row tells whether there is a next page without counting the whole table
+        found = get_leaderboard_store().search(
+            difficulty, name=name.strip() if name else None, since=since,
+            limit=HISTORY_PAGE_SIZE + 1, after=cursors[-1],
+        )
+        page_rows = found[:HISTORY_PAGE_SIZE]
+        if not page_rows:
+            st.caption("No scores found.")
+            return
+        offset = (len(cursors) - 1) * HISTORY_PAGE_SIZE
+        table = {"Rank": list(range(offset + 1, offset + len(page_rows) + 1))}
+        table.update(as_columns(page_rows, COLUMNS))
+        st.dataframe(table, hide_index=True, use_container_width=True)
+        col1, col2, col3 = st.columns([1, 2, 1])
+        if col1.button("◀ Previous", key="history_prev", disabled=len(cursors) == 1):
+            cursors.pop()
+            rerun_fragment()
+        col2.caption(f"Page {len(cursors)}")
+        if col3.button("Next ▶", key="history_next", disabled=len(found) <= HISTORY_PAGE_SIZE):
+            last = page_rows[-1]
+            cursors.append((last[2], last[4], last[5]))
+            rerun_fragment()
+
+history_view()
 
 st.markdown("---")
 st.caption("© 2025 Memory Puzzle Game | Enhanced with ❤️")
+perf_lap("leaderboard")
+end_run()
+
+# Optional perf panel: recent reruns across all sessions of this process
+@st.fragment
+def perf_panel():
+    st.markdown("### 📈 Perf")
+    st.button("Refresh", key="perf_refresh")
+    records = get_perf_log().recent(200)
+    if not records:
+        st.caption("No reruns recorded yet.")
+        return
+    summary = summarize(records, by=("scope",))
+    st.dataframe(
+        [{"scope": scope, "section": section, **stats} for (scope, section), stats in summary.items()],
+        hide_index=True, use_container_width=True,
+    )
+    game = st.session_state.game_handle.game
+    if game.moves:
+        st.caption(f"Reruns per move this game: {st.session_state.perf_game_reruns / game.moves:.2f}")
+    footprint = get_session_registry().footprint()
+    st.caption(
+        f"Games in memory: {footprint['resident']}/{footprint['max_resident']} "
+        f"({footprint['resident_bytes'] / 1024:.1f} KB), this one {deep_sizeof(game)} B; "
+        f"on disk: {footprint['snapshots']} ({footprint['snapshot_bytes'] / 1024:.1f} KB), "
+        f"snapshot {len(game.to_bytes())} B; evicted {footprint['evictions']}, restored {footprint['restores']}"
+    )
+    st.caption(f"Metrics file: `{get_perf_log().path or 'disabled'}`")
+
+if show_perf:
+    with st.sidebar:
+        perf_panel()
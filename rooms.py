@@ -0,0 +1,216 @@
+"""Shared game rooms for online multiplayer.
+
+Every room's game lives in one process-wide RoomStore, so players on
+different browsers act on the same MemoryGame. Each room has its own lock,
+a version that goes up on every change, and a Condition on that lock: a
+session waits for the version to move past the one it last rendered and is
+woken as soon as another player's flip lands, instead of polling.
+"""
+import random
+import string
+import threading
+import time
+
+from engine import INVALID, MemoryGame
+
+ROOM_CODE_LENGTH = 4
+MAX_PLAYERS = 4
+ROOM_TTL = 3600  # seconds without activity before a room is dropped
+# Room fragment schedule (project.py and benchmarks/bench_rooms.py): a run
+# every ROOM_POLL_INTERVAL that waits up to ROOM_LONG_POLL for a change. A
+# move landing between runs waits for the next tick, so the interval bounds
+# the worst-case flip-to-update latency. Only live rooms poll: see Room.live()
+ROOM_POLL_INTERVAL = 0.5
+ROOM_LONG_POLL = 0.35
+
+
+class Room:
+    """One shared game; mutate it only through RoomStore"""
+
+    __slots__ = ("code", "game", "version", "flip_back_delay", "wait_until", "last_active", "changed_at", "cond",
+                 "left")
+
+    def __init__(self, code, rows, cols, host, flip_back_delay):
+        self.code = code
+        self.game = MemoryGame(rows, cols, [host])
+        self.version = 0
+        self.flip_back_delay = flip_back_delay
+        self.wait_until = None  # monotonic deadline for flipping a missed pair back
+        self.last_active = self.changed_at = time.monotonic()
+        self.cond = threading.Condition(threading.Lock())
+        self.left = set()  # indices of players who left; their turns are skipped
+
+    @property
+    def lock(self):
+        return self.cond
+
+    def _next_active(self, player):
+        n = len(self.game.player_names)
+        for step in range(1, n + 1):
+            if (player + step) % n not in self.left:
+                return (player + step) % n
+        return player
+
+    def turn(self):
+        """Index of the player who clicks next (after a pending miss, the one it passes to)"""
+        game = self.game
+        return self._next_active(game.current_player) if game.waiting else game.current_player
+
+    def live(self):
+        """True while another player's move can change the board: the game is on and someone else is seated.
+
+        Sessions on a room that isn't live stop the fragment timer and refresh on demand.
+        """
+        return not self.game.game_over and len(self.game.player_names) - len(self.left) > 1
+
+    def _skip_left(self):
+        game = self.game
+        if not game.waiting and game.current_player in self.left:
+            game.current_player = self._next_active(game.current_player)
+
+    def _changed(self):
+        # Called with the lock held
+        self._skip_left()
+        self.version += 1
+        self.last_active = self.changed_at = time.monotonic()
+        self.cond.notify_all()
+
+    def _resolve_due(self):
+        if self.game.waiting and time.monotonic() >= self.wait_until:
+            self.game.resolve_miss()
+            self.wait_until = None
+            self._changed()
+
+
+class RoomStore:
+    """Process-wide registry of rooms, keyed by a short join code"""
+
+    def __init__(self, ttl=ROOM_TTL, rng=None):
+        self.ttl = ttl
+        self.rooms = {}
+        self._lock = threading.Lock()
+        self._rng = rng or random.SystemRandom()
+        self._last_expire = time.monotonic()
+
+    def create(self, rows, cols, host, flip_back_delay=1.5):
+        """New room hosted by `host` (player 0); returns the room"""
+        with self._lock:
+            self._expire()
+            while True:
+                code = "".join(self._rng.choice(string.ascii_uppercase) for _ in range(ROOM_CODE_LENGTH))
+                if code not in self.rooms:
+                    break
+            room = self.rooms[code] = Room(code, rows, cols, host, flip_back_delay)
+        return room
+
+    def get(self, code):
+        with self._lock:
+            # Every session looks its room up on each run, so idle rooms are reclaimed here
+            if time.monotonic() - self._last_expire > 60:
+                self._expire()
+            return self.rooms.get((code or "").strip().upper())
+
+    def join(self, code, name):
+        """Add a player to a room that hasn't started; returns (room, player index).
+
+        A name already in the room only gets its seat back if that player left.
+        """
+        room = self.get(code)
+        if room is None:
+            raise KeyError(f"no room {code!r}")
+        with room.lock:
+            game = room.game
+            if name in game.player_names:
+                player = game.player_names.index(name)
+                if player not in room.left:
+                    raise ValueError("name taken")
+                room.left.discard(player)
+                room._changed()
+                return room, player
+            if game.start_time is not None:
+                raise ValueError("game already started")
+            if len(game.player_names) >= MAX_PLAYERS:
+                raise ValueError("room is full")
+            room.game = MemoryGame(game.rows, game.cols, game.player_names + [name], deck=game.deck)
+            room._changed()
+            return room, len(game.player_names)
+
+    def leave(self, room, player):
+        """Take a player out of the turn rotation; the room closes when everyone has left"""
+        with room.lock:
+            game = room.game
+            if not game.waiting and game.current_player == player and game.first_choice is not None:
+                # Turn a half-made pair back down before the turn moves on
+                game.flipped &= ~(1 << game.first_choice)
+                game.first_choice = None
+            room.left.add(player)
+            everyone_left = len(room.left) >= len(game.player_names)
+            room._changed()
+        if everyone_left:
+            with self._lock:
+                if self.rooms.get(room.code) is room:
+                    del self.rooms[room.code]
+
+    def restart(self, room):
+        with room.lock:
+            game = room.game
+            room.game = MemoryGame(game.rows, game.cols, game.player_names)
+            room.wait_until = None
+            room._changed()
+
+    def apply_flips(self, room, player, flips, version):
+        """Apply a burst of `player`'s clicks made at game `version`; returns their outcomes.
+
+        The burst is dropped if the game has moved on since `version`, and cut
+        short at the first click that isn't the player's turn or can't be
+        flipped. A pending miss is flipped back when the next player clicks.
+        """
+        with room.lock:
+            game = room.game
+            if not game.is_current(version):
+                return []
+            outcomes = []
+            for cell in flips:
+                if room.turn() != player:
+                    break
+                if game.waiting and game.can_flip(cell):
+                    # Flip the pending miss back here, so the turn skips players who left
+                    game.resolve_miss()
+                    room._skip_left()
+                result = game.apply_flip(cell)
+                if result.outcome == INVALID:
+                    break
+                outcomes.append(result.outcome)
+            if outcomes:
+                room.wait_until = time.monotonic() + room.flip_back_delay if game.waiting else None
+                room._changed()
+            return outcomes
+
+    def resolve_due(self, room):
+        with room.lock:
+            room._resolve_due()
+
+    def wait(self, room, seen_version, timeout):
+        """Block until the room's version differs from `seen_version` or `timeout` passes; returns the version.
+
+        A missed pair whose flip-back deadline passes while waiting is resolved here.
+        """
+        deadline = time.monotonic() + timeout
+        with room.lock:
+            while room.version == seen_version:
+                room._resolve_due()
+                if room.version != seen_version:
+                    break
+                now = time.monotonic()
+                if now >= deadline:
+                    break
+                wake = deadline if room.wait_until is None else min(deadline, room.wait_until)
+                room.cond.wait(max(0.0, wake - now))
+            return room.version
+
+    def _expire(self):
+        # Called with the store lock held
+        self._last_expire = time.monotonic()
+        cutoff = time.monotonic() - self.ttl
+        for code in [code for code, room in self.rooms.items() if room.last_active < cutoff]:
+            del self.rooms[code]
@@ -0,0 +1,226 @@
+"""Process-wide game registry with a resident-memory cap.
+
+Sessions keep only a GameHandle (a token) in st.session_state; the game
+itself lives here. Games idle longer than `idle_seconds`, and the least
+recently used ones past `max_resident`, are written to a compact snapshot
+file (MemoryGame.to_bytes, tens to hundreds of bytes) and dropped from
+memory. The next access restores them transparently, so the number of live
+games per server is bounded however many tabs are left open.
+"""
+import os
+import re
+import secrets
+import struct
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from engine import MemoryGame
+
+SESSION_DIR = os.environ.get("SESSION_DIR", "sessions")
+SESSION_IDLE_SECONDS = float(os.environ.get("SESSION_IDLE_SECONDS", 600))
+MAX_RESIDENT_GAMES = int(os.environ.get("MAX_RESIDENT_GAMES", 1000))
+SNAPSHOT_TTL = 7 * 24 * 3600  # seconds before an unclaimed snapshot is deleted
+TOKEN_BYTES = 9
+# What token_urlsafe(TOKEN_BYTES) produces; tokens come from the URL and name files
+_TOKEN_RE = re.compile(r"[A-Za-z0-9_-]{%d}" % len(secrets.token_urlsafe(TOKEN_BYTES)))
+
+
+def new_token():
+    return secrets.token_urlsafe(TOKEN_BYTES)
+
+
+def valid_token(token):
+    return isinstance(token, str) and _TOKEN_RE.fullmatch(token) is not None
+
+
+def deep_sizeof(obj, seen=None):
+    """Rough recursive sys.getsizeof, following containers and __slots__"""
+    seen = set() if seen is None else seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set)):
+        size += sum(deep_sizeof(x, seen) for x in obj)
+    for slot in getattr(type(obj), "__slots__", ()):
+        size += deep_sizeof(getattr(obj, slot, None), seen)
+    return size
+
+
+class SessionRegistry:
+    """token -> MemoryGame, with idle/LRU eviction to snapshot files"""
+
+    def __init__(self, directory=SESSION_DIR, idle_seconds=SESSION_IDLE_SECONDS,
+                 max_resident=MAX_RESIDENT_GAMES, snapshot_ttl=SNAPSHOT_TTL):
+        self.directory = directory
+        self.idle_seconds = idle_seconds
+        self.max_resident = max_resident
+        self.snapshot_ttl = snapshot_ttl
+        self.resident = OrderedDict()  # token -> (game, last used), least recently used first
+        self.owners = {}  # token -> id of the live session playing it
+        self.evictions = 0
+        self.restores = 0
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, token):
+        if not valid_token(token):
+            raise ValueError(f"bad session token {token!r}")
+        return os.path.join(self.directory, f"{token}.game")
+
+    def put(self, token, game, owner=None):
+        """Store a session's game; returns the token it is stored under.
+
+        If another live session owns `token`, the game goes under a new token instead.
+        """
+        if not valid_token(token):
+            raise ValueError(f"bad session token {token!r}")
+        with self._lock:
+            if owner is not None:
+                if self.owners.get(token, owner) != owner:
+                    token = new_token()
+                self.owners[token] = owner
+            self.resident[token] = (game, time.monotonic())
+            self.resident.move_to_end(token)
+            self._sweep(keep=token)
+            return token
+
+    def claim(self, token, owner):
+        """Make `owner` the live session for `token`; whoever had it moves to a copy on its next access"""
+        with self._lock:
+            self.owners[token] = owner
+
+    def checkout(self, token, owner):
+        """(token, game) for `owner`. If another session has claimed the token
+        since (the same URL opened in a second tab), this one carries on with
+        its own copy of the game under a new token, so no game is shared."""
+        with self._lock:
+            game = self._get(token)
+            if game is None:
+                return token, None
+            current = self.owners.setdefault(token, owner)
+            if current == owner:
+                return token, game
+            token = new_token()
+            game = MemoryGame.from_bytes(game.to_bytes())
+            self.owners[token] = owner
+            self.resident[token] = (game, time.monotonic())
+            self._sweep(keep=token)
+            return token, game
+
+    def get(self, token):
+        """The session's game, restored from its snapshot if it was evicted; None if unknown"""
+        with self._lock:
+            return self._get(token)
+
+    def _get(self, token):
+        # Called with the lock held
+        entry = self.resident.get(token)
+        if entry is not None:
+            game = entry[0]
+        else:
+            game = self._restore(token)
+            if game is None:
+                return None
+        self.resident[token] = (game, time.monotonic())
+        self.resident.move_to_end(token)
+        self._sweep(keep=token)
+        return game
+
+    def _restore(self, token):
+        if not valid_token(token):
+            return None
+        path = self._path(token)
+        try:
+            with open(path, "rb") as f:
+                game = MemoryGame.from_bytes(f.read())
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, struct.error):
+            # Unreadable or from an incompatible build: drop it and start over
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        os.remove(path)
+        self.restores += 1
+        return game
+
+    def _evict(self, token):
+        game, _ = self.resident.pop(token)
+        self.owners.pop(token, None)  # whichever session comes back first owns it again
+        tmp = self._path(token) + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(game.to_bytes())
+        os.replace(tmp, self._path(token))
+        self.evictions += 1
+
+    def _sweep(self, keep=None):
+        # Called with the lock held; the oldest entries come first
+        cutoff = time.monotonic() - self.idle_seconds
+        for token, (_, last_used) in list(self.resident.items()):
+            over_cap = len(self.resident) > self.max_resident
+            if token == keep or not (over_cap or last_used < cutoff):
+                break
+            self._evict(token)
+        if time.monotonic() - self._last_prune > 3600:
+            self._last_prune = time.monotonic()
+            self._prune_snapshots()
+
+    def _prune_snapshots(self):
+        cutoff = time.time() - self.snapshot_ttl
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".game") and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+
+    def sweep(self):
+        """Evict idle games now (also happens on every put/get)"""
+        with self._lock:
+            self._sweep()
+
+    def footprint(self):
+        """Resident and on-disk totals for the perf panel"""
+        with self._lock:
+            games = [game for game, _ in self.resident.values()]
+            resident_bytes = sum(deep_sizeof(game) for game in games)
+        snapshots = [e for e in os.scandir(self.directory) if e.name.endswith(".game")]
+        return {
+            "resident": len(games),
+            "resident_bytes": resident_bytes,
+            "max_resident": self.max_resident,
+            "snapshots": len(snapshots),
+            "snapshot_bytes": sum(e.stat().st_size for e in snapshots),
+            "evictions": self.evictions,
+            "restores": self.restores,
+        }
+
+
+class GameHandle:
+    """What a session keeps in st.session_state: a token into the registry.
+
+    The token can change: a session whose URL is opened in another tab hands
+    the game over to that tab and continues on a copy under a new token.
+    """
+
+    __slots__ = ("registry", "token", "owner")
+
+    def __init__(self, registry, token):
+        self.registry = registry
+        self.token = token
+        self.owner = new_token()
+        registry.claim(token, self.owner)
+
+    @property
+    def game(self):
+        self.token, game = self.registry.checkout(self.token, self.owner)
+        return game
+
+    @game.setter
+    def game(self, game):
+        self.token = self.registry.put(self.token, game, self.owner)
@@ -0,0 +1,269 @@
+"""Headless self-play simulator for balancing and benchmarking.
+
+Plays many games through the MemoryGame engine with pluggable bot strategies,
+spread over a process pool, and reports move distributions per board size and
+player count.
+
+    python simulate.py --games 100000 --strategy perfect --players 1 2
+    python simulate.py --sizes 6x6 8x8 --strategy forgetful --decay 0.05
+"""
+import argparse
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from engine import INVALID, MISS, MemoryGame
+
+DEFAULT_SIZES = ["2x2", "4x4", "6x6"]
+
+
+class CardPool:
+    """Set of cells with O(1) add, remove and uniform random choice"""
+
+    __slots__ = ("items", "pos")
+
+    def __init__(self, cells=()):
+        self.items = list(cells)
+        self.pos = {c: k for k, c in enumerate(self.items)}
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, c):
+        if c not in self.pos:
+            self.pos[c] = len(self.items)
+            self.items.append(c)
+
+    def discard(self, c):
+        k = self.pos.pop(c, None)
+        if k is not None:
+            last = self.items.pop()
+            if k < len(self.items):
+                self.items[k] = last
+                self.pos[last] = k
+
+    def choice(self, rng, exclude=None):
+        while True:
+            c = self.items[int(rng.random() * len(self.items))]
+            if c != exclude:
+                return c
+
+
+class RandomStrategy:
+    """Flips random face-down cards and remembers nothing"""
+
+    def __init__(self, rng, size):
+        self.rng = rng
+        self.face_down = CardPool(range(size))
+
+    def observe(self, i, face):
+        pass
+
+    def forget(self, i):
+        # Called for matched cards only
+        self.face_down.discard(i)
+
+    def choose(self, game, first):
+        return self.face_down.choice(self.rng, exclude=first)
+
+
+class PerfectMemoryStrategy:
+    """Remembers every card it has seen; takes known pairs, otherwise explores"""
+
+    def __init__(self, rng, size):
+        self.rng = rng
+        self.unseen = CardPool(range(size))
+        self.known = {}      # cell -> face
+        self.by_face = {}    # face -> set of known cells
+        self.pairs = set()   # faces with both cells known
+
+    def observe(self, i, face):
+        if i not in self.known:
+            self.unseen.discard(i)
+            self.known[i] = face
+            cells = self.by_face.setdefault(face, set())
+            cells.add(i)
+            if len(cells) == 2:
+                self.pairs.add(face)
+
+    def _drop(self, i):
+        face = self.known.pop(i, None)
+        if face is not None:
+            cells = self.by_face[face]
+            cells.discard(i)
+            self.pairs.discard(face)
+            if not cells:
+                del self.by_face[face]
+
+    def forget(self, i):
+        # Called for matched cards: they leave the board for good
+        self._drop(i)
+        self.unseen.discard(i)
+
+    def choose(self, game, first):
+        if first is None:
+            # Take a known pair if there is one
+            if self.pairs:
+                return next(iter(self.by_face[next(iter(self.pairs))]))
+            if self.unseen:
+                return self.unseen.choice(self.rng)
+            return next(iter(self.known))
+        # Second card: the partner of the first if known, else explore
+        for i in self.by_face.get(game.deck[first], ()):
+            if i != first:
+                return i
+        if self.unseen:
+            return self.unseen.choice(self.rng)
+        return next(i for i in self.known if i != first)
+
+
+class ForgetfulStrategy(PerfectMemoryStrategy):
+    """Perfect memory, except each remembered card is forgotten with probability `decay` per flip"""
+
+    def __init__(self, rng, size, decay=0.05):
+        super().__init__(rng, size)
+        self.decay = decay
+
+    def observe(self, i, face):
+        if self.decay > 0:
+            for cell in [c for c in self.known if self.rng.random() < self.decay]:
+                # A forgotten card is as good as unseen again
+                self._drop(cell)
+                self.unseen.add(cell)
+        super().observe(i, face)
+
+
+STRATEGIES = {
+    "random": RandomStrategy,
+    "perfect": PerfectMemoryStrategy,
+    "forgetful": ForgetfulStrategy,
+}
+
+
+def make_strategy(name, rng, size, decay):
+    if name == "forgetful":
+        return ForgetfulStrategy(rng, size, decay)
+    return STRATEGIES[name](rng, size)
+
+
+def play_game(rows, cols, players, strategy, decay, rng):
+    """Play one game to the end and return its move count"""
+    game = MemoryGame(rows, cols, [f"Bot {k + 1}" for k in range(players)], rng=rng)
+    bots = [make_strategy(strategy, rng, game.size, decay) for _ in range(players)]
+    while not game.game_over:
+        bot = bots[game.current_player]
+        first = bot.choose(game, None)
+        game.apply_flip(first)
+        for b in bots:
+            b.observe(first, game.deck[first])
+        second = bot.choose(game, first)
+        result = game.apply_flip(second)
+        if result.outcome == INVALID:
+            raise RuntimeError(f"{strategy} strategy chose an invalid card {second}")
+        if result.outcome == MISS:
+            for b in bots:
+                b.observe(second, game.deck[second])
+            game.resolve_miss()
+        else:
+            for b in bots:
+                b.forget(first)
+                b.forget(second)
+    return game.moves
+
+
+def run_batch(task):
+    """Worker entry point: play a batch of games and return a moves histogram"""
+    rows, cols, players, strategy, decay, games, seed = task
+    rng = random.Random(seed)
+    return Counter(play_game(rows, cols, players, strategy, decay, rng) for _ in range(games))
+
+
+def percentile(histogram, q):
+    """q-th percentile (0-100) of a value -> count histogram"""
+    total = sum(histogram.values())
+    target = q / 100 * (total - 1)
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if seen > target:
+            return value
+    return max(histogram)
+
+
+def summarize(histogram):
+    games = sum(histogram.values())
+    mean = sum(v * n for v, n in histogram.items()) / games
+    variance = sum(n * (v - mean) ** 2 for v, n in histogram.items()) / games
+    return {
+        "games": games,
+        "mean": mean,
+        "stdev": math.sqrt(variance),
+        "min": min(histogram),
+        "p50": percentile(histogram, 50),
+        "p90": percentile(histogram, 90),
+        "p99": percentile(histogram, 99),
+        "max": max(histogram),
+        "histogram": {str(v): histogram[v] for v in sorted(histogram)},
+    }
+
+
+def simulate(sizes, player_counts, strategy, games, decay=0.05, workers=None, batch=2000, seed=0):
+    """Run games for every (size, player count) over a process pool; returns summaries"""
+    tasks, keys = [], []
+    seeds = random.Random(seed)
+    for size in sizes:
+        rows, cols = (int(x) for x in size.lower().split("x"))
+        for players in player_counts:
+            remaining = games
+            while remaining > 0:
+                n = min(batch, remaining)
+                tasks.append((rows, cols, players, strategy, decay, n, seeds.getrandbits(64)))
+                keys.append((size, players))
+                remaining -= n
+
+    histograms = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for key, hist in zip(keys, pool.map(run_batch, tasks)):
+            histograms.setdefault(key, Counter()).update(hist)
+    return {key: summarize(hist) for key, hist in histograms.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="board sizes as RxC")
+    parser.add_argument("--players", nargs="+", type=int, default=[1], help="player counts")
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="perfect")
+    parser.add_argument("--decay", type=float, default=0.05, help="forget probability per flip (forgetful)")
+    parser.add_argument("--games", type=int, default=10000, help="games per size and player count")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", metavar="PATH", help="also write the summaries as JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    results = simulate(args.sizes, args.players, args.strategy, args.games,
+                       decay=args.decay, workers=args.workers, seed=args.seed)
+    elapsed = time.perf_counter() - start
+
+    total = sum(r["games"] for r in results.values())
+    print(f"{args.strategy} strategy, {total} games in {elapsed:.1f}s ({total / elapsed:.0f} games/s)")
+    print(f"{'size':>6} {'players':>7} {'mean':>8} {'stdev':>7} {'min':>5} {'p50':>5} {'p90':>5} {'p99':>5} {'max':>5}")
+    for (size, players), r in results.items():
+        print(f"{size:>6} {players:>7} {r['mean']:8.2f} {r['stdev']:7.2f} {r['min']:5d} "
+              f"{r['p50']:5d} {r['p90']:5d} {r['p99']:5d} {r['max']:5d}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                [{"size": size, "players": players, "strategy": args.strategy, **r}
+                 for (size, players), r in results.items()],
+                f, indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
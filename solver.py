@@ -0,0 +1,108 @@
+"""Expected moves for a perfect-memory player, by dynamic programming.
+
+State is (u, k): u cards never seen, k known singletons (seen cards whose
+partner is still unseen). Each move flips an unseen card first:
+
+* with probability k/u it is the partner of a known card, which is then
+  matched: one move, to (u-1, k-1);
+* otherwise it is new, and the player either flips another unseen card
+  (match; partner of an older known card, matched next move; or another new
+  card) or deliberately flips a known card to avoid revealing more, whichever
+  gives the lower expectation.
+
+The app reads expected moves for the supported boards from par_table.json,
+written at build time, so a lookup costs nothing at run time:
+
+    python solver.py            # print the table for the supported boards
+    python solver.py --write    # regenerate par_table.json after changing the grids or the DP
+"""
+import argparse
+import json
+import os
+from functools import lru_cache
+
+from engine import DIFFICULTIES
+
+# Grid sizes offered by the app, as (rows, cols)
+SUPPORTED_GRIDS = list(DIFFICULTIES.values())
+PAR_TABLE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "par_table.json")
+
+
+@lru_cache(maxsize=None)
+def _expected(u, k):
+    """Expected remaining moves from (u unseen cards, k known singletons)"""
+    if u == 0:
+        return 0.0
+    # First card is the partner of a known singleton: match it right away
+    total = k / u * (1 + _expected(u - 1, k - 1)) if k else 0.0
+    if u == k:
+        return total
+
+    # First card is new; best choice for the second card
+    rest = u - 1
+    explore = 1 / rest * (1 + _expected(u - 2, k))
+    if k:
+        explore += k / rest * (2 + _expected(u - 2, k))
+    if rest - 1 - k > 0:
+        explore += (rest - 1 - k) / rest * (1 + _expected(u - 2, k + 2))
+    best = explore
+    if k:
+        # Flip a known card as the second card: a sure miss that reveals nothing new
+        best = min(best, 1 + _expected(u - 1, k + 1))
+    return total + (u - k) / u * best
+
+
+def expected_moves(num_pairs):
+    """Expected moves to clear a board of num_pairs pairs with perfect memory"""
+    return _expected(2 * num_pairs, 0)
+
+
+def build_table(grids=SUPPORTED_GRIDS):
+    """num_pairs -> expected moves for every grid size"""
+    table = {}
+    for rows, cols in sorted(grids, key=lambda g: g[0] * g[1]):
+        pairs = (rows * cols) // 2
+        table[pairs] = expected_moves(pairs)
+    return table
+
+
+def write_table(path=PAR_TABLE_FILE, grids=SUPPORTED_GRIDS):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({str(pairs): moves for pairs, moves in build_table(grids).items()}, f, indent=1)
+        f.write("\n")
+
+
+def load_table(path=PAR_TABLE_FILE):
+    """The table written by write_table(), or {} if it is missing or unreadable"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {int(pairs): float(moves) for pairs, moves in json.load(f).items()}
+    except (OSError, ValueError, AttributeError):
+        return {}
+
+
+_table = load_table()
+
+
+def par(num_pairs):
+    """Expected moves for a board: a table lookup for the supported grids, computed once for any other size"""
+    moves = _table.get(num_pairs)
+    if moves is None:
+        moves = _table[num_pairs] = expected_moves(num_pairs)
+    return moves
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Expected moves for a perfect-memory player")
+    parser.add_argument("--write", action="store_true", help=f"regenerate {os.path.basename(PAR_TABLE_FILE)}")
+    args = parser.parse_args(argv)
+    if args.write:
+        write_table()
+        print(f"wrote {PAR_TABLE_FILE}")
+        return
+    for pairs, moves in build_table().items():
+        print(f"{pairs:3d} pairs, expected {moves:8.3f} moves ({moves / pairs:.3f} per pair)")
+
+
+if __name__ == "__main__":
+    main()
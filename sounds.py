@@ -0,0 +1,81 @@
+import base64
+import io
+import json
+import math
+import os
+import struct
+import wave
+
+SAMPLE_RATE = 22050
+
+# Audio sprite: every game sound in one small 8-bit, 8 kHz file that the
+# board component downloads once and the browser caches
+SPRITE_RATE = 8000
+SPRITE_GAP = 0.05  # seconds of silence between slots
+SPRITE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend", "board")
+
+# Fixed game sounds: name -> (frequency, duration)
+SOUND_BANK = {
+    "flip": (440, 0.1),     # A4 note
+    "match": (660, 0.3),    # E5 note
+    "victory": (880, 0.5),  # A5 note
+    "miss": (220, 0.2),     # A3 note
+}
+
+# Sound effect functions. The tones are a few thousand samples each, so the
+# standard library is fast enough and numpy/scipy never load at startup.
+def generate_tone(frequency, duration=0.2, sample_rate=SAMPLE_RATE):
+    """Generate a simple tone for sound effects"""
+    n = int(sample_rate * duration)
+    step = duration / (n - 1) if n > 1 else 0.0
+    return [math.sin(2 * math.pi * frequency * k * step) * 0.3 for k in range(n)]
+
+def _write_wav(buffer, sample_rate, wave_data):
+    """Write 16-bit mono PCM with the standard library wave module"""
+    frames = struct.pack(f"<{len(wave_data)}h", *(int(x * 32767) for x in wave_data))
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(frames)
+
+def create_audio_data(wave_data, sample_rate=SAMPLE_RATE):
+    """Convert wave to base64 audio data"""
+    buffer = io.BytesIO()
+    _write_wav(buffer, sample_rate, wave_data)
+
+    # Convert to base64
+    audio_b64 = base64.b64encode(buffer.getvalue()).decode()
+    return f"data:audio/wav;base64,{audio_b64}"
+
+def build_sprite(sample_rate=SPRITE_RATE, gap=SPRITE_GAP):
+    """All game sounds in one 8-bit mono WAV; returns (wav bytes, {name: [offset, duration]} in seconds)"""
+    samples = bytearray()
+    slots = {}
+    for name, (frequency, duration) in SOUND_BANK.items():
+        slots[name] = [round(len(samples) / sample_rate, 4), duration]
+        samples += bytes(int(128 + x * 127) for x in generate_tone(frequency, duration, sample_rate))
+        samples += b"\x80" * int(gap * sample_rate)
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)  # 8-bit PCM is unsigned, silence is 0x80
+        wav.setframerate(sample_rate)
+        wav.writeframes(bytes(samples))
+    return buffer.getvalue(), slots
+
+def write_sprite(directory=SPRITE_DIR):
+    """Write sprite.wav and sprite.json to `directory`, skipping files that are up to date"""
+    data, slots = build_sprite()
+    for name, content in (("sprite.wav", data), ("sprite.json", json.dumps(slots).encode())):
+        path = os.path.join(directory, name)
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                if f.read() == content:
+                    continue
+        with open(path, "wb") as f:
+            f.write(content)
+
+if __name__ == "__main__":
+    write_sprite()
+    print(os.path.join(SPRITE_DIR, "sprite.wav"))
@@ -0,0 +1,302 @@
+"""Streaming leaderboard statistics.
+
+Per difficulty: KLL quantile sketches of moves and finishing time, an exact
+moves histogram and running totals; per player and difficulty: games, best,
+and running totals for averages. Everything is folded in one row at a time
+as scores commit, so a rank ("top X%") or a summary costs the same at a
+hundred rows or millions. The state is a JSON file (leaderboard_stats.json),
+written by a background thread at most every SAVE_INTERVAL, never by the
+thread committing scores; on start-up only rows added since it was written
+are read from the store.
+"""
+import atexit
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+
+from leaderboard_store import duration_seconds
+
+STATS_FILE = os.environ.get("STATS_FILE", "leaderboard_stats.json")
+SAVE_INTERVAL = 5.0  # seconds between writes of the state file
+
+log = logging.getLogger(__name__)
+
+
+class KLLSketch:
+    """KLL quantile sketch: O(k) items whatever the stream length, rank error on the order of 1/k"""
+
+    __slots__ = ("k", "n", "levels", "_rng")
+
+    def __init__(self, k=200):
+        self.k = k
+        self.n = 0
+        self.levels = [[]]  # items at level h stand for 2**h values each
+        self._rng = random.Random()
+
+    def _capacity(self, level):
+        # Lower levels get geometrically smaller buffers; the top one holds k
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, value):
+        self.levels[0].append(value)
+        self.n += 1
+        if len(self.levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def _compress(self):
+        # Sort each full level and promote every other item (random offset) at double weight
+        for level, items in enumerate(self.levels):
+            if len(items) < self._capacity(level):
+                continue
+            if level + 1 == len(self.levels):
+                self.levels.append([])
+            items.sort()
+            leftover = [items.pop()] if len(items) % 2 else []
+            self.levels[level + 1].extend(items[self._rng.random() < 0.5::2])
+            items[:] = leftover
+
+    def rank(self, value):
+        """Approximate number of values <= `value`"""
+        return sum(sum(1 for x in items if x <= value) << level for level, items in enumerate(self.levels))
+
+    def quantile(self, q):
+        """Approximate value at fraction `q` of the sorted stream, or None if empty"""
+        if not self.n:
+            return None
+        weighted = sorted((x, 1 << level) for level, items in enumerate(self.levels) for x in items)
+        target = q * self.n
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def to_dict(self):
+        return {"k": self.k, "n": self.n, "levels": [list(items) for items in self.levels]}
+
+    @classmethod
+    def from_dict(cls, data):
+        sketch = cls(data["k"])
+        sketch.n = data["n"]
+        sketch.levels = data["levels"]
+        return sketch
+
+
+class DifficultyStats:
+    """Sketches, histogram and totals for one difficulty"""
+
+    __slots__ = ("games", "moves_total", "seconds_total", "timed", "moves", "seconds", "histogram")
+
+    def __init__(self, k=200):
+        self.games = self.moves_total = self.seconds_total = self.timed = 0
+        self.moves = KLLSketch(k)
+        self.seconds = KLLSketch(k)
+        self.histogram = {}  # moves -> games
+
+    def add(self, moves, seconds):
+        self.games += 1
+        self.moves_total += moves
+        self.moves.update(moves)
+        self.histogram[moves] = self.histogram.get(moves, 0) + 1
+        if seconds is not None:
+            self.timed += 1
+            self.seconds_total += seconds
+            self.seconds.update(seconds)
+
+    def to_dict(self):
+        return {
+            "games": self.games, "moves_total": self.moves_total,
+            "seconds_total": self.seconds_total, "timed": self.timed,
+            "moves": self.moves.to_dict(), "seconds": self.seconds.to_dict(),
+            "histogram": {str(moves): count for moves, count in self.histogram.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.games, stats.moves_total = data["games"], data["moves_total"]
+        stats.seconds_total, stats.timed = data["seconds_total"], data["timed"]
+        stats.moves = KLLSketch.from_dict(data["moves"])
+        stats.seconds = KLLSketch.from_dict(data["seconds"])
+        stats.histogram = {int(moves): count for moves, count in data["histogram"].items()}
+        return stats
+
+
+class LeaderboardStats:
+    """Incremental leaderboard statistics, kept in sync with a LeaderboardStore"""
+
+    def __init__(self, store, path=STATS_FILE, k=200, batch=100000):
+        self.store = store
+        self.path = path
+        self.k = k
+        self.batch = batch
+        self.version = None
+        self.generation = None  # store.generation() the state was built from
+        self.last_id = 0      # highest score id folded in
+        self._boards = {}     # difficulty -> DifficultyStats
+        # (name, difficulty) -> (games, best moves, moves total, seconds total, timed games).
+        # Tuples, replaced on every update, so save() copies the dict and serializes it outside the lock
+        self._players = {}
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._save_lock = threading.Lock()  # one writer of the state file at a time
+        self._save_due = threading.Event()
+        self._saved_at = 0.0
+        self._load()
+        store.subscribe(self._on_append)
+        store.subscribe_reset(self._on_reset)
+        self._saver = threading.Thread(target=self._save_loop, name="leaderboard-stats", daemon=True)
+        self._saver.start()
+        atexit.register(self.save)
+
+    def _add(self, name, difficulty, moves, duration):
+        seconds = duration_seconds(duration)
+        board = self._boards.get(difficulty)
+        if board is None:
+            board = self._boards[difficulty] = DifficultyStats(self.k)
+        board.add(moves, seconds)
+        games, best, moves_total, seconds_total, timed = self._players.get((name, difficulty), (0, moves, 0, 0, 0))
+        if seconds is not None:
+            seconds_total += seconds
+            timed += 1
+        self._players[(name, difficulty)] = (games + 1, min(best, moves), moves_total + moves, seconds_total, timed)
+
+    def _on_append(self, rows, old_version, new_version):
+        # Called with the store's lock held, so last_id() is the id of the last of `rows`
+        with self._lock:
+            if self.version != old_version:
+                return
+            for name, difficulty, moves, duration, _ in rows:
+                self._add(name, difficulty, moves, duration)
+            self.last_id = self.store.last_id()
+            self.version = new_version
+        # The store's (and the writer's) lock is held here: leave the file to the saver thread
+        self._save_due.set()
+
+    def _on_reset(self):
+        # The leaderboard was replaced (cleared): drop everything, the next read rebuilds
+        with self._lock:
+            self._boards, self._players, self.last_id = {}, {}, 0
+            self.generation = self.version = None
+
+    def _sync(self):
+        if self.version == self.store.version():
+            return
+        with self._sync_lock:
+            generation = self.store.generation()
+            if generation != self.generation:
+                # First run, or the table was replaced (maybe by another process): start over
+                with self._lock:
+                    self._boards, self._players, self.last_id = {}, {}, 0
+                    self.generation = generation
+            # Read outside our lock: the store calls _on_append with its own lock held
+            while True:
+                version, rows = self.store.changes_after(self.last_id, self.batch)
+                with self._lock:
+                    for _, name, difficulty, moves, duration, _ in rows:
+                        self._add(name, difficulty, moves, duration)
+                    if rows:
+                        self.last_id = rows[-1][0]
+                    if len(rows) < self.batch:
+                        self.version = version
+                        break
+        self._save_due.set()
+
+    def _state(self):
+        # Only copies under the lock (the player dict shallowly, ~15 ms at 300k
+        # players); building and writing the JSON happens after it is released
+        with self._lock:
+            if self.generation is None:
+                return None
+            boards = {difficulty: board.to_dict() for difficulty, board in self._boards.items()}
+            players = dict(self._players)
+            generation, last_id = self.generation, self.last_id
+        by_difficulty = {}
+        for (name, difficulty), player in players.items():
+            by_difficulty.setdefault(difficulty, {})[name] = player
+        return {"generation": generation, "last_id": last_id, "boards": boards, "players": by_difficulty}
+
+    def save(self):
+        """Write the state file now (atomically); the saver thread does this every SAVE_INTERVAL as scores arrive"""
+        with self._save_lock:
+            state = self._state()
+            if state is None:
+                return
+            self._saved_at = time.monotonic()
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp, self.path)
+
+    def _save_loop(self):
+        while True:
+            self._save_due.wait()
+            time.sleep(max(0.0, self._saved_at + SAVE_INTERVAL - time.monotonic()))
+            self._save_due.clear()
+            try:
+                self.save()
+            except OSError:
+                log.exception("could not write %s", self.path)
+
+    def _load(self):
+        # A missing, stale-format or damaged file just means one rebuild from the store
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+            boards = {difficulty: DifficultyStats.from_dict(board) for difficulty, board in state["boards"].items()}
+            players = {(name, difficulty): tuple(player)
+                       for difficulty, names in state["players"].items() for name, player in names.items()}
+            generation, last_id = state["generation"], int(state["last_id"])
+        except (OSError, ValueError, KeyError, TypeError, IndexError, AttributeError):
+            return
+        self._boards, self._players = boards, players
+        self.generation, self.last_id = generation, last_id
+
+    def rank(self, difficulty, moves):
+        """Share of games on a difficulty finished in `moves` or fewer (lower is better), or None"""
+        self._sync()
+        with self._lock:
+            board = self._boards.get(difficulty)
+            if board is None or not board.games:
+                return None
+            return min(1.0, board.moves.rank(moves) / board.games)
+
+    def summary(self, difficulty):
+        """Games, moves quartiles, averages and the moves histogram for a difficulty, or None"""
+        self._sync()
+        with self._lock:
+            board = self._boards.get(difficulty)
+            if board is None or not board.games:
+                return None
+            return {
+                "games": board.games,
+                "best": min(board.histogram),
+                "p25": board.moves.quantile(0.25),
+                "median": board.moves.quantile(0.5),
+                "p75": board.moves.quantile(0.75),
+                "mean_moves": board.moves_total / board.games,
+                "median_seconds": board.seconds.quantile(0.5),
+                "mean_seconds": board.seconds_total / board.timed if board.timed else None,
+                "histogram": sorted(board.histogram.items()),
+            }
+
+    def player(self, name, difficulty):
+        """Games, best and averages for one player on a difficulty, or None"""
+        self._sync()
+        with self._lock:
+            player = self._players.get((name, difficulty))
+        if player is None:
+            return None
+        games, best, moves_total, seconds_total, timed = player
+        return {
+            "games": games,
+            "best": best,
+            "mean_moves": moves_total / games,
+            "mean_seconds": seconds_total / timed if timed else None,
+        }
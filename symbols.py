@@ -0,0 +1,41 @@
+"""Card face catalog.
+
+Faces come from the emoji lists first; past those, glyph/color combinations
+are generated, so card_faces(n) always returns n distinct faces. A face is a
+(symbol, color) tuple, where color is None for emoji.
+"""
+from functools import lru_cache
+
+EMOJIS = ['🐶','🐱','🐭','🦊','🐻','🐼','🐨','🐯','🐸','🐵','🐔','🐧','🐴','🦄','🐝','🐢','🐙','🦋']
+
+# More emoji for bigger boards, used after EMOJIS
+EXTRA_EMOJIS = [
+    '🐷','🐮','🐰','🐹','🦁','🐺','🦝','🦓','🦒','🐘','🦏','🐪','🦘','🦥','🦦','🦔',
+    '🐳','🐬','🦈','🐠','🦀','🦞','🐌','🐞','🦂','🕷️','🦉','🦅','🦜','🦩','🦚','🐊',
+    '🍎','🍊','🍋','🍉','🍇','🍓','🍒','🍑','🍍','🥝','🥑','🌽','🥕','🍄','🌵','🌻',
+    '⚽','🏀','🎲','🎸','🎺','🚗','🚀','⛵','🎈','💎','🔑','⏰','📚','🎁','🌈','⭐',
+]
+
+# Generated faces: every glyph in every color
+GLYPHS = ['●','▲','■','◆','★','♥','♠','♣','✚','✖','☀','☂','♞','⚑','✿','❄']
+COLORS = ['#e11d48','#2563eb','#16a34a','#d97706','#7c3aed','#0891b2','#db2777','#4b5563']
+
+
+def _generated_faces():
+    for color in COLORS:
+        for glyph in GLYPHS:
+            yield (glyph, color)
+
+
+MAX_FACES = len(EMOJIS) + len(EXTRA_EMOJIS) + len(GLYPHS) * len(COLORS)
+
+
+@lru_cache(maxsize=None)
+def card_faces(n):
+    """Tuple of n distinct faces for a board with n pairs"""
+    if n > MAX_FACES:
+        raise ValueError(f"only {MAX_FACES} distinct card faces available, {n} requested")
+    faces = [(e, None) for e in EMOJIS + EXTRA_EMOJIS]
+    if n > len(faces):
+        faces.extend(_generated_faces())
+    return tuple(faces[:n])
@@ -0,0 +1,78 @@
+import random
+
+from engine import FIRST, GAME_OVER, INVALID, MATCH, MISS, MemoryGame
+
+
+def pair_cells(game):
+    """(a, b) with matching faces and (a, c) with different faces"""
+    positions = {}
+    for cell, face in enumerate(game.deck):
+        positions.setdefault(face, []).append(cell)
+    a, b = positions[game.deck[0]]
+    c = next(cell for cell in range(game.size) if game.deck[cell] != game.deck[a])
+    return (a, b), (a, c)
+
+
+def test_deck_holds_each_pair_twice():
+    game = MemoryGame(6, 6, rng=random.Random(0))
+    assert game.num_pairs == 18
+    assert sorted(game.deck) == sorted(list(range(18)) * 2)
+    assert game.deck.typecode == "B"
+    assert MemoryGame(24, 24).deck.typecode == "H"
+
+
+def test_match_keeps_the_turn():
+    game = MemoryGame(4, 4, ["Ann", "Bob"], rng=random.Random(4))
+    (a, b), _ = pair_cells(game)
+    game.apply_flip(a)
+    result = game.apply_flip(b)
+    assert result.outcome == MATCH and result.player == 0 and result.other == a
+    assert game.current_player == 0 and game.player_scores == [1, 0]
+    assert game.is_matched(a) and game.is_matched(b) and game.flipped == 0
+
+
+def test_miss_passes_the_turn_when_resolved():
+    game = MemoryGame(4, 4, ["Ann", "Bob"], rng=random.Random(5))
+    _, (a, c) = pair_cells(game)
+    assert game.apply_flip(a).outcome == FIRST
+    assert game.apply_flip(c).outcome == MISS
+    assert game.waiting and game.moves == 1 and game.current_player == 0
+    game.resolve_miss()
+    assert not game.waiting and game.flipped == 0 and game.current_player == 1
+
+
+def test_next_flip_resolves_a_pending_miss():
+    game = MemoryGame(4, 4, ["Ann", "Bob"], rng=random.Random(6))
+    _, (a, c) = pair_cells(game)
+    game.apply_flip(a)
+    game.apply_flip(c)
+    # Clicking one of the missed cards again is allowed: they flip back first
+    result = game.apply_flip(c)
+    assert result.outcome == FIRST and result.player == 1
+    assert game.flipped == 1 << c
+
+
+def test_invalid_flips():
+    game = MemoryGame(2, 2, rng=random.Random(7))
+    (a, b), _ = pair_cells(game)
+    assert game.apply_flip(-1).outcome == INVALID
+    assert game.apply_flip(game.size).outcome == INVALID
+    game.apply_flip(a)
+    assert game.apply_flip(a).outcome == INVALID
+    game.apply_flip(b)
+    assert game.apply_flip(b).outcome == INVALID
+    assert game.moves == 1
+
+
+def test_game_over():
+    game = MemoryGame(2, 2, rng=random.Random(8))
+    positions = {}
+    for cell, face in enumerate(game.deck):
+        positions.setdefault(face, []).append(cell)
+    outcomes = []
+    for first, second in positions.values():
+        game.apply_flip(first)
+        outcomes.append(game.apply_flip(second).outcome)
+    assert outcomes == [MATCH, GAME_OVER]
+    assert game.game_over and game.end_time is not None
+    assert all(game.apply_flip(cell).outcome == INVALID for cell in range(game.size))
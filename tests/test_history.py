@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+from history import ParquetHistory, since_days
+from leaderboard_store import LeaderboardStore
+
+HARD = "Hard (6x6)"
+ROWS = [
+    ("Ann", HARD, 20, "01:00", "2025-01-01 12:00:00"),
+    ("Bob", HARD, 30, "02:00", "2025-01-02 12:00:00"),
+    ("Ann", HARD, 25, "01:30", "2025-01-03 12:00:00"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeaderboardStore(str(tmp_path / "leaderboard.db"))
+
+
+def test_keyset_pages_match_full_order(store):
+    store.add_scores([(f"p{i % 7}", HARD, 18 + i % 5, "01:00", f"2025-01-{1 + i % 28:02d} 12:00:00")
+                      for i in range(60)])
+    everything = store.search(HARD, limit=1000)
+    pages, after = [], None
+    while True:
+        page = store.search(HARD, limit=25, after=after)
+        pages.extend(page)
+        if len(page) < 25:
+            break
+        after = (page[-1][2], page[-1][4], page[-1][5])
+    assert pages == everything and len(pages) == 60
+
+
+def test_search_filters(store):
+    store.add_scores(ROWS)
+    assert [row[2] for row in store.search(HARD, name="Ann")] == [20, 25]
+    assert [row[0] for row in store.search(HARD, since="2025-01-02 00:00:00")] == ["Ann", "Bob"]
+
+
+def test_since_days():
+    assert since_days(7, now=datetime(2025, 1, 8, 12, 0, 0)) == "2025-01-01 12:00:00"
+
+
+def test_export_is_incremental(store, tmp_path):
+    pytest.importorskip("pyarrow")
+    history = ParquetHistory(str(tmp_path / "history"))
+    store.add_scores(ROWS[:2])
+    assert history.export(store) == 2
+    assert history.export(store) == 0
+    store.add_scores(ROWS[2:])
+    assert history.export(store) == 1
+    assert history.search(HARD) == [row[:5] for row in store.search(HARD)]
+    assert [row[2] for row in history.search(HARD, name="Ann")] == [20, 25]
+
+
+def test_export_after_clear_keeps_earlier_files(store, tmp_path):
+    pytest.importorskip("pyarrow")
+    history = ParquetHistory(str(tmp_path / "history"))
+    store.add_scores(ROWS)
+    assert history.export(store) == 3
+    # Row ids start over after a clear; the new files must not replace the old ones
+    store.replace_all([("Cat", HARD, 40, "03:00", "2025-01-04 12:00:00")])
+    assert history.export(store) == 1
+    assert [row[0] for row in history.search(HARD)] == ["Ann", "Ann", "Bob", "Cat"]
@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from leaderboard_index import LeaderboardIndex
+from leaderboard_store import LeaderboardStore
+
+HARD = "Hard (6x6)"
+ROWS = [
+    ("Ann", HARD, 20, "01:00", "2025-01-01 12:00:00"),
+    ("Bob", HARD, 30, "02:00", "2025-01-02 12:00:00"),
+    ("Ann", HARD, 25, "01:30", "2025-01-03 12:00:00"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeaderboardStore(str(tmp_path / "leaderboard.db"))
+
+
+def test_follows_appends(store):
+    index = LeaderboardIndex(store)
+    assert index.top_scores(HARD) == []
+    store.add_scores(ROWS)
+    assert [row[0] for row in index.top_scores(HARD)] == ["Ann", "Ann", "Bob"]
+    assert index.personal_best("Ann", HARD)[2] == 20
+    assert index.personal_best("Cat", HARD) is None
+
+
+def test_matches_the_store_with_many_rows(store):
+    rng = random.Random(0)
+    index = LeaderboardIndex(store, top_n=10)
+    index.rebuild()
+    # Distinct timestamps: rows tied on (moves, date) have no defined order
+    stamps = rng.sample(range(28 * 86400), 500)
+    for batch in range(20):
+        store.add_scores([(f"p{rng.randrange(30)}", HARD, rng.randrange(18, 60), "01:00",
+                           f"2025-01-{1 + t // 86400:02d} {t % 86400 // 3600:02d}:{t % 3600 // 60:02d}:{t % 60:02d}")
+                          for t in stamps[batch * 25:(batch + 1) * 25]])
+    assert index.top_scores(HARD) == store.top_scores(HARD, 10)
+    assert index.top_scores(HARD, 5) == store.top_scores(HARD, 5)
+    for name in ("p0", "p7", "p29"):
+        assert index.personal_best(name, HARD) == store.personal_best(name, HARD)
+    # Deeper than the index holds: answered by the store
+    assert index.top_scores(HARD, 50) == store.top_scores(HARD, 50)
+
+
+def test_empty_after_clear(store):
+    index = LeaderboardIndex(store)
+    store.add_scores(ROWS)
+    assert index.top_scores(HARD)
+    store.replace_all([])
+    assert index.top_scores(HARD) == []
+    assert index.personal_best("Ann", HARD) is None
+    store.add_score("Cat", HARD, 40, "03:00", "2025-01-04 12:00:00")
+    assert [row[0] for row in index.top_scores(HARD)] == ["Cat"]
+
+
+def test_rebuilds_after_a_write_through_another_connection(store):
+    index = LeaderboardIndex(store)
+    store.add_scores(ROWS)
+    assert len(index.top_scores(HARD)) == 3
+    LeaderboardStore(store.path).replace_all([ROWS[1]])
+    assert [row[0] for row in index.top_scores(HARD)] == ["Bob"]
+    LeaderboardStore(store.path).add_score("Dan", HARD, 19, "00:40", "2025-01-05 12:00:00")
+    assert [row[0] for row in index.top_scores(HARD)] == ["Dan", "Bob"]
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+from leaderboard_store import LeaderboardStore
+
+HARD = "Hard (6x6)"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeaderboardStore(str(tmp_path / "leaderboard.db"))
+
+
+def write_csv(path, lines):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def test_top_scores_order_by_moves_then_date(store):
+    store.add_scores([
+        ("Bob", HARD, 30, "02:00", "2025-01-02 12:00:00"),
+        ("Ann", HARD, 20, "01:00", "2025-01-03 12:00:00"),
+        ("Cat", HARD, 20, "01:10", "2025-01-01 12:00:00"),
+        ("Dan", "Easy (2x2)", 2, "00:05", "2025-01-01 12:00:00"),
+    ])
+    assert [row[0] for row in store.top_scores(HARD)] == ["Cat", "Ann", "Bob"]
+    assert store.personal_best("Ann", HARD) == ("Ann", HARD, 20, "01:00", "2025-01-03 12:00:00")
+    assert store.personal_best("Ann", "Easy (2x2)") is None
+
+
+def test_import_csv_keeps_time(store, tmp_path):
+    path = tmp_path / "Leaderboard.csv"
+    write_csv(path, [
+        "Name,Difficulty,Moves,Time,Date",
+        ",Easy (2x2),2,00:09,2025-05-29 10:11:05",
+        "Ann,Hard (6x6),25,01:45,2025-05-30 09:00:00",
+        "Bob,Hard (6x6),31,,2025-05-30 10:00:00",
+        "Bad,,,,",
+    ])
+    assert store.import_csv(str(path)) == 3
+    rows = store.top_scores(HARD)
+    assert rows == [("Ann", HARD, 25, "01:45", "2025-05-30 09:00:00"), ("Bob", HARD, 31, None, "2025-05-30 10:00:00")]
+    assert store.top_scores("Easy (2x2)") == [("", "Easy (2x2)", 2, "00:09", "2025-05-29 10:11:05")]
+
+
+def test_import_csv_without_time_column(store, tmp_path):
+    path = tmp_path / "old.csv"
+    write_csv(path, ["Name,Difficulty,Moves,Date", "Ann,Hard (6x6),25,2025-05-30 09:00:00"])
+    assert store.import_csv(str(path)) == 1
+    assert store.top_scores(HARD) == [("Ann", HARD, 25, None, "2025-05-30 09:00:00")]
+
+
+def test_import_csv_runs_once_per_file(store, tmp_path):
+    path = tmp_path / "Leaderboard.csv"
+    write_csv(path, ["Name,Difficulty,Moves,Time,Date", "Ann,Hard (6x6),25,01:45,2025-05-30 09:00:00"])
+    assert store.import_csv(str(path)) == 1
+    assert store.import_csv(str(path)) == 0
+    # The same file under another name (a hard link here; a case variant on some filesystems)
+    os.link(path, tmp_path / "leaderboard.csv")
+    assert store.import_csv(str(tmp_path / "leaderboard.csv")) == 0
+    assert store.import_csv(str(tmp_path / "missing.csv")) == 0
+    assert len(store.top_scores(HARD)) == 1
+
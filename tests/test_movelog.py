@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from engine import INVALID, MemoryGame
+from movelog import RECORD, MoveLog, analyze, new_log_path, read_log, replay
+
+
+def play_logged(game, path, rng):
+    """Play random legal flips to the end, logging them the way the app does"""
+    log = MoveLog(path, game)
+    cells = list(range(game.size))
+    while not game.game_over:
+        cell = rng.choice([c for c in cells if game.can_flip(c)] or cells)
+        result = game.apply_flip(cell)
+        if result.outcome != INVALID:
+            log.record(cell, result.player)
+            if result.other is not None:
+                log.flush()
+    log.flush()
+
+
+def test_replay_round_trip(tmp_path):
+    rng = random.Random(3)
+    game = MemoryGame(4, 4, ["Ann", "Bob"], rng=rng)
+    path = new_log_path(str(tmp_path))
+    play_logged(game, path, rng)
+
+    header, records = read_log(path)
+    assert (header["rows"], header["cols"]) == (4, 4)
+    assert header["player_names"] == ["Ann", "Bob"]
+    assert list(header["deck"]) == list(game.deck)
+    assert len(records) == 2 * game.moves
+
+    replayed, results = replay(path)
+    assert replayed.game_over
+    assert replayed.moves == game.moves
+    assert replayed.player_scores == game.player_scores
+    assert [r.player for r in results] == [player for _, player, _ in records]
+
+
+def test_torn_last_record_is_ignored(tmp_path):
+    rng = random.Random(5)
+    game = MemoryGame(2, 4, rng=rng)
+    path = str(tmp_path / "game.mgl")
+    play_logged(game, path, rng)
+    with open(path, "ab") as f:
+        f.write(RECORD.pack(0, 0, 0)[:3])
+    replayed, _ = replay(path)
+    assert replayed.moves == game.moves
+
+
+def test_replay_rejects_a_diverging_log(tmp_path):
+    game = MemoryGame(2, 4, ["Ann", "Bob"], rng=random.Random(1))
+    path = str(tmp_path / "game.mgl")
+    log = MoveLog(path, game)
+    log.record(0, 1)  # Bob never has the first turn
+    log.flush()
+    with pytest.raises(ValueError):
+        replay(path)
+
+
+def test_analyze_counts_games_and_pairs(tmp_path):
+    rng = random.Random(7)
+    games = [MemoryGame(2, 4, ["Ann"], rng=rng) for _ in range(3)]
+    for n, game in enumerate(games):
+        play_logged(game, str(tmp_path / f"{n}.mgl"), rng)
+    stats = analyze(sorted(str(p) for p in tmp_path.glob("*.mgl")))
+    assert stats["games"] == 3
+    assert stats["attempts"]["Ann"] == sum(game.moves for game in games)
+    assert stats["accuracy"]["Ann"] == pytest.approx(3 * 4 / sum(game.moves for game in games))
+    assert sum(stats["hot_cells"].values()) == 2 * sum(game.moves for game in games)
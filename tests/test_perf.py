@@ -0,0 +1,61 @@
+import atexit
+import json
+
+from perf import PerfLog, PerfRecorder, load_records, summarize
+
+
+def record(n, trigger="flips"):
+    run = PerfRecorder("fragment", trigger, difficulty="Hard (6x6)")
+    run.spans["board"] = float(n)
+    return run.finish()
+
+
+def make_log(path, **kwargs):
+    log = PerfLog(str(path), **kwargs)
+    atexit.unregister(log.flush)
+    return log
+
+
+def test_records_are_buffered_until_flush(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    log = make_log(path, flush_interval=3600)
+    for n in range(3):
+        log.add(record(n))
+    assert not path.exists()
+    assert len(log.recent()) == 3
+    log.flush()
+    assert [r["spans"]["board"] for r in load_records(str(path))] == [0.0, 1.0, 2.0]
+    assert load_records(str(path))[0]["trigger"] == "flips"
+
+
+def test_flush_when_interval_passes(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    log = make_log(path, flush_interval=0)
+    log.add(record(1))
+    assert len(load_records(str(path))) == 1
+
+
+def test_file_is_rotated_past_max_bytes(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    line = len(json.dumps(record(0), separators=(",", ":"))) + 1
+    log = make_log(path, flush_interval=0, max_bytes=3 * line)
+    for n in range(7):
+        log.add(record(n))
+    current = load_records(str(path))
+    rotated = load_records(str(path) + ".1")
+    assert len(current) <= 3 and len(rotated) <= 3
+    assert current[-1]["spans"]["board"] == 6.0
+    assert not (tmp_path / "metrics.jsonl.2").exists()
+
+
+def test_unwritable_path_is_ignored(tmp_path):
+    log = make_log(tmp_path / "missing" / "metrics.jsonl", flush_interval=0)
+    log.add(record(1))
+    assert len(log.recent()) == 1
+
+
+def test_summarize_groups_by_trigger():
+    records = [record(1), record(3), record(5, trigger="expire")]
+    summary = summarize(records, by=("scope", "trigger"))
+    assert summary[("fragment", "flips", "board")]["count"] == 2
+    assert summary[("fragment", "expire", "board")]["p50"] == 5.0
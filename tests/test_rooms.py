@@ -0,0 +1,88 @@
+import random
+
+import pytest
+
+from engine import FIRST, MISS
+from rooms import RoomStore
+
+
+def two_player_room():
+    store = RoomStore(rng=random.Random(0))
+    room = store.create(4, 4, "Ann", flip_back_delay=0)
+    store.join(room.code, "Bob")
+    return store, room
+
+
+def miss_cells(game):
+    a = 0
+    c = next(cell for cell in range(game.size) if game.deck[cell] != game.deck[a])
+    return a, c
+
+
+def test_wrong_turn_clicks_are_rejected():
+    store, room = two_player_room()
+    version = room.game.version
+    assert store.apply_flips(room, 1, [0, 1], version) == []
+    assert room.game.flipped == 0 and room.game.version == version
+
+
+def test_burst_stops_when_the_turn_passes():
+    store, room = two_player_room()
+    a, c = miss_cells(room.game)
+    other = next(cell for cell in range(room.game.size) if cell not in (a, c))
+    assert store.apply_flips(room, 0, [a, c, other], room.game.version) == [FIRST, MISS]
+    assert room.turn() == 1
+    assert not room.game.is_flipped(other)
+
+    # Ann can't click again; Bob's first click flips the miss back and counts
+    assert store.apply_flips(room, 0, [other], room.game.version) == []
+    assert store.apply_flips(room, 1, [other], room.game.version) == [FIRST]
+    assert room.game.current_player == 1 and room.game.is_flipped(other)
+
+
+def test_stale_version_is_dropped():
+    store, room = two_player_room()
+    stale = room.game.version
+    store.apply_flips(room, 0, [0], stale)
+    assert store.apply_flips(room, 0, [1], stale) == []
+
+
+def test_leave_passes_the_turn():
+    store, room = two_player_room()
+    store.apply_flips(room, 0, [0], room.game.version)
+    store.leave(room, 0)
+    assert room.turn() == 1 and room.game.flipped == 0
+    assert store.apply_flips(room, 1, [0], room.game.version) == [FIRST]
+    store.leave(room, 1)
+    assert store.get(room.code) is None
+
+
+def test_duplicate_name_is_rejected():
+    store, room = two_player_room()
+    with pytest.raises(ValueError, match="name taken"):
+        store.join(room.code, "Bob")
+    assert room.game.player_names == ["Ann", "Bob"]
+
+
+def test_a_player_who_left_gets_their_seat_back():
+    store, room = two_player_room()
+    store.join(room.code, "Cat")
+    store.leave(room, 1)
+    assert store.join(room.code, "Bob") == (room, 1)
+    assert 1 not in room.left
+
+
+def test_live_only_with_a_game_on_and_another_player():
+    store = RoomStore(rng=random.Random(0))
+    room = store.create(2, 2, "Ann", flip_back_delay=0)
+    assert not room.live()
+    store.join(room.code, "Bob")
+    assert room.live()
+    # Matches keep the turn, so Ann clears the board in one burst
+    cells = sorted(range(room.game.size), key=lambda cell: room.game.deck[cell])
+    store.apply_flips(room, 0, cells, room.game.version)
+    assert room.game.game_over and not room.live()
+    store.restart(room)
+    assert room.live()
+    store.leave(room, 1)
+    assert not room.live()
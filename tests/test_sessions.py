@@ -0,0 +1,69 @@
+import os
+import random
+
+import pytest
+
+from engine import MemoryGame
+from sessions import GameHandle, SessionRegistry, new_token
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return SessionRegistry(str(tmp_path), max_resident=1)
+
+
+@pytest.mark.parametrize("token", ["../evil", "", "a" * 200, "x/../../y"])
+def test_bad_tokens_are_rejected(registry, token):
+    with pytest.raises(ValueError):
+        registry.put(token, MemoryGame(2, 2))
+    assert registry.get(token) is None
+
+
+def test_evicted_game_is_restored(registry):
+    first, second = new_token(), new_token()
+    game = MemoryGame(4, 4, rng=random.Random(0))
+    game.apply_flip(3)
+    registry.put(first, game)
+    registry.put(second, MemoryGame(2, 2))  # over max_resident: first goes to disk
+    assert first not in registry.resident
+    restored = registry.get(first)
+    assert restored.to_bytes() == game.to_bytes()
+    assert registry.restores == 1
+
+
+def test_corrupt_snapshot_is_discarded(registry):
+    token = new_token()
+    path = os.path.join(registry.directory, f"{token}.game")
+    with open(path, "wb") as f:
+        f.write(b"MG\x02\x00")
+    assert registry.get(token) is None
+    assert not os.path.exists(path)
+
+
+def test_second_tab_gets_its_own_game(registry):
+    token = new_token()
+    registry.put(token, MemoryGame(4, 4, rng=random.Random(1)))
+    first = GameHandle(registry, token)
+    game = first.game
+    second = GameHandle(registry, token)  # same ?s= opened in another tab
+    assert second.game is game and second.token == token
+    forked = first.game
+    assert first.token != token and forked is not game
+    assert forked.to_bytes() == game.to_bytes()
+
+
+def test_idle_games_are_swept_to_disk(tmp_path):
+    registry = SessionRegistry(str(tmp_path), idle_seconds=0)
+    token = new_token()
+    registry.put(token, MemoryGame(2, 2))
+    registry.sweep()
+    assert token not in registry.resident
+    assert os.path.exists(os.path.join(registry.directory, f"{token}.game"))
+    assert registry.get(token) is not None and registry.restores == 1
+
+
+def test_put_from_another_owner_gets_a_new_token(registry):
+    token = new_token()
+    assert registry.put(token, MemoryGame(2, 2), owner="a") == token
+    moved = registry.put(token, MemoryGame(2, 2), owner="b")
+    assert moved != token and registry.owners[moved] == "b"
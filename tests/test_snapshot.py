@@ -0,0 +1,84 @@
+import random
+
+import pytest
+
+from engine import FIRST, MISS, MemoryGame
+
+
+def pair_cells(game):
+    """(a, b) with matching faces and (a, c) with different faces"""
+    positions = {}
+    for cell, face in enumerate(game.deck):
+        positions.setdefault(face, []).append(cell)
+    a, b = positions[game.deck[0]]
+    c = next(cell for cell in range(game.size) if game.deck[cell] != game.deck[a])
+    return (a, b), (a, c)
+
+
+def state(game):
+    return {slot: getattr(game, slot) for slot in MemoryGame.__slots__ if slot != "deck"} | {"deck": list(game.deck)}
+
+
+@pytest.mark.parametrize("rows, cols", [(2, 2), (6, 6), (20, 20), (24, 24)])
+def test_snapshot_round_trip(rows, cols):
+    game = MemoryGame(rows, cols, ["Ann", "Bob"], rng=random.Random(rows))
+    assert state(MemoryGame.from_bytes(game.to_bytes())) == state(game)
+
+    (a, b), _ = pair_cells(game)
+    game.apply_flip(a)
+    game.apply_flip(b)
+    game.apply_flip(next(cell for cell in range(game.size) if not game.is_matched(cell)))
+    restored = MemoryGame.from_bytes(game.to_bytes())
+    assert state(restored) == state(game)
+    assert restored.version == game.version > 0
+
+
+def test_snapshot_round_trip_pending_miss():
+    game = MemoryGame(4, 4, ["Ann", "Bob"], rng=random.Random(1))
+    _, (a, c) = pair_cells(game)
+    game.apply_flip(a)
+    assert game.apply_flip(c).outcome == MISS
+    restored = MemoryGame.from_bytes(game.to_bytes())
+    assert restored.waiting and restored.is_flipped(a) and restored.is_flipped(c)
+    restored.resolve_miss()
+    assert restored.current_player == 1 and restored.flipped == 0
+
+
+def test_legacy_snapshot_loads_with_version_zero():
+    game = MemoryGame(4, 4, ["Ann"], rng=random.Random(2))
+    game.apply_flip(0)
+    data = game.to_bytes()
+    # Rewrite as format 1: no magic/format prefix and no game version field
+    header = MemoryGame._SNAPSHOT.unpack_from(data, MemoryGame._PREFIX.size)
+    legacy = MemoryGame._SNAPSHOT_V1.pack(*header[:7], *header[8:])
+    body = data[MemoryGame._PREFIX.size + MemoryGame._SNAPSHOT.size:]
+    restored = MemoryGame.from_bytes(legacy + body)
+    assert restored.version == 0
+    assert restored.first_choice == 0 and list(restored.deck) == list(game.deck)
+
+
+@pytest.mark.parametrize("data", [b"", b"MG\x09" + bytes(40), b"garbage", None])
+def test_unreadable_snapshot_raises_value_error(data):
+    if data is None:
+        data = MemoryGame(2, 2).to_bytes()[:-1]
+    with pytest.raises(ValueError):
+        MemoryGame.from_bytes(data)
+
+
+def test_is_current_across_resolve_miss():
+    game = MemoryGame(4, 4, ["Ann", "Bob"], rng=random.Random(3))
+    _, (a, c) = pair_cells(game)
+    assert game.apply_flip(a).outcome == FIRST
+    assert game.apply_flip(c).outcome == MISS
+    seen = game.version
+    game.resolve_miss()
+    # Flipping the pair back doesn't change what can be clicked
+    assert game.is_current(seen) and game.is_current(game.version)
+    assert not game.is_current(seen - 1)
+    assert not game.is_current(None)
+
+    # The next flip makes input from before the flip-back stale
+    game.apply_flip(a)
+    assert not game.is_current(seen)
+    assert game.resolved_version is None
+
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from engine import GAME_OVER, MATCH, MemoryGame
+from solver import build_table, expected_moves, load_table, par, write_table
+
+
+def perfect_play(game, rng):
+    """Moves for the optimal perfect-memory policy the DP models"""
+    known = {}  # face -> cells seen but not matched yet
+    unseen = list(range(game.size))
+    rng.shuffle(unseen)
+    while not game.game_over:
+        face_pairs = [face for face, cells in known.items() if len(cells) == 2]
+        if face_pairs:
+            first, second = known.pop(face_pairs[0])
+        else:
+            first = unseen.pop()
+            face = game.deck[first]
+            if face in known:
+                second = known.pop(face)[0]
+            else:
+                known[face] = [first]
+                # Always explore with the second card: the DP's choice on these boards
+                second = unseen.pop()
+                if game.deck[second] == face:
+                    known.pop(face)
+                else:
+                    known.setdefault(game.deck[second], []).append(second)
+        game.apply_flip(first)
+        outcome = game.apply_flip(second).outcome
+        if outcome not in (MATCH, GAME_OVER):
+            game.resolve_miss()
+    return game.moves
+
+
+def test_small_boards_exact():
+    assert expected_moves(1) == pytest.approx(1.0)
+    # First pick misses with probability 2/3 and then needs two more moves
+    assert expected_moves(2) == pytest.approx(8 / 3)
+    assert expected_moves(3) == pytest.approx(13 / 3)
+
+
+@pytest.mark.parametrize("pairs", [2, 3])
+def test_matches_simulated_perfect_play(pairs):
+    rng = random.Random(pairs)
+    games = 20000
+    total = sum(perfect_play(MemoryGame(1, 2 * pairs, rng=rng), rng) for _ in range(games))
+    assert total / games == pytest.approx(expected_moves(pairs), rel=0.02)
+
+
+def test_grows_with_the_board():
+    values = [expected_moves(pairs) for pairs in (2, 8, 18, 32, 50, 200)]
+    assert values == sorted(values)
+    for pairs, moves in zip((2, 8, 18, 32, 50, 200), values):
+        # Never better than one move per pair, never as bad as two
+        assert pairs <= moves < 2 * pairs
+
+
+def test_par_is_expected_moves():
+    assert par(18) == pytest.approx(expected_moves(18))
+
+
+def test_checked_in_table_is_current():
+    # Regenerate with `python solver.py --write` if this fails
+    assert load_table() == pytest.approx(build_table())
+
+
+def test_table_round_trip(tmp_path):
+    path = str(tmp_path / "par.json")
+    write_table(path, grids=[(2, 2), (4, 4)])
+    assert load_table(path) == pytest.approx({2: 8 / 3, 8: expected_moves(8)})
+    assert load_table(str(tmp_path / "missing.json")) == {}
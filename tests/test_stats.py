@@ -0,0 +1,124 @@
+import atexit
+import json
+import threading
+import time
+
+import pytest
+
+import stats as stats_module
+from leaderboard_store import LeaderboardStore, duration_seconds
+from stats import KLLSketch, LeaderboardStats
+
+HARD = "Hard (6x6)"
+ROWS = [
+    ("Ann", HARD, 20, "01:00", "2025-01-01 12:00:00"),
+    ("Bob", HARD, 30, "02:00", "2025-01-02 12:00:00"),
+    ("Ann", HARD, 25, "01:30", "2025-01-03 12:00:00"),
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeaderboardStore(str(tmp_path / "leaderboard.db"))
+
+
+def make_stats(store, path):
+    stats = LeaderboardStats(store, str(path))
+    atexit.unregister(stats.save)  # the temporary directory is gone by exit
+    return stats
+
+
+@pytest.fixture
+def stats(store, tmp_path):
+    return make_stats(store, tmp_path / "stats.json")
+
+
+def test_stats_follow_appends(store, stats):
+    assert stats.summary(HARD) is None
+    store.add_scores(ROWS)
+    summary = stats.summary(HARD)
+    assert summary["games"] == 3 and summary["best"] == 20
+    assert summary["histogram"] == [(20, 1), (25, 1), (30, 1)]
+    assert summary["mean_seconds"] == pytest.approx(90)
+    assert stats.player("Ann", HARD) == {"games": 2, "best": 20, "mean_moves": 22.5, "mean_seconds": 75}
+    assert stats.rank(HARD, 25) == pytest.approx(2 / 3)
+
+
+def test_stats_empty_after_clear(store, stats):
+    store.add_scores(ROWS)
+    assert stats.summary(HARD)
+    store.replace_all([])
+    assert stats.summary(HARD) is None
+    assert stats.player("Ann", HARD) is None
+    assert stats.rank(HARD, 20) is None
+    store.add_score("Cat", HARD, 40, "03:00", "2025-01-04 12:00:00")
+    assert stats.summary(HARD)["games"] == 1
+
+
+def test_clear_through_another_connection(store, stats):
+    store.add_scores(ROWS)
+    assert stats.summary(HARD)["games"] == 3
+    LeaderboardStore(store.path).replace_all([ROWS[1]])
+    assert stats.summary(HARD)["games"] == 1
+    assert stats.player("Ann", HARD) is None
+
+
+def test_state_file_round_trip(store, stats, tmp_path):
+    store.add_scores(ROWS)
+    stats.summary(HARD)
+    stats.save()
+    with open(stats.path, encoding="utf-8") as f:
+        assert json.load(f)["players"][HARD]["Ann"] == [2, 20, 45, 150, 2]
+    reloaded = make_stats(store, stats.path)
+    assert reloaded.last_id == store.last_id() and reloaded.generation == store.generation()
+    assert reloaded.player("Ann", HARD) == stats.player("Ann", HARD)
+    assert reloaded.summary(HARD) == stats.summary(HARD)
+
+
+@pytest.mark.parametrize("content", ["", "{", '{"boards": []}', '{"generation": "x", "last_id": 0, "boards": {}, '
+                                                                  '"players": [["Ann", "Hard (6x6)", 1, 20, 20, 0, 0]]}'])
+def test_unreadable_state_file_is_rebuilt(store, tmp_path, content):
+    # The last case is the old format, one list per player
+    store.add_scores(ROWS)
+    path = tmp_path / "stats.json"
+    path.write_text(content)
+    stats = make_stats(store, path)
+    assert stats.summary(HARD)["games"] == 3
+    assert stats.player("Ann", HARD)["games"] == 2
+
+
+def test_saving_never_blocks_a_commit(store, stats, monkeypatch):
+    stats.summary(HARD)  # builds the state, so appends from here on are folded in
+    writing = threading.Event()
+    release = threading.Event()
+    dump = json.dump
+
+    def slow_dump(*args, **kwargs):
+        writing.set()
+        assert release.wait(5.0)
+        dump(*args, **kwargs)
+
+    monkeypatch.setattr(stats_module.json, "dump", slow_dump)
+    store.add_scores(ROWS[:1])
+    assert writing.wait(5.0)  # the saver thread is stuck in the middle of a write
+    start = time.monotonic()
+    store.add_scores(ROWS[1:])
+    assert stats.player("Ann", HARD)["games"] == 2
+    assert time.monotonic() - start < 1.0
+    release.set()
+
+
+def test_sketch_quantiles_within_error():
+    sketch = KLLSketch(k=200)
+    for value in range(100000):
+        sketch.update(value)
+    assert sketch.n == 100000
+    assert sum(len(items) for items in sketch.levels) < 2000
+    assert sketch.quantile(0.5) == pytest.approx(50000, abs=2000)
+    assert sketch.rank(25000) == pytest.approx(25000, abs=2000)
+
+
+@pytest.mark.parametrize("duration, seconds", [("01:45", 105), ("00:09", 9), ("7", 420), ("", None), (None, None),
+                                               ("ab:cd", None)])
+def test_duration_seconds(duration, seconds):
+    assert duration_seconds(duration) == seconds
@@ -0,0 +1,38 @@
+import pytest
+
+from board_component import board_args
+from engine import DIFFICULTIES, MemoryGame
+from symbols import EMOJIS, MAX_FACES, card_faces
+
+
+def test_faces_unique_up_to_200_pairs():
+    for n in range(1, 201):
+        faces = card_faces(n)
+        assert len(faces) == n
+        assert len(set(faces)) == n
+    assert MAX_FACES >= 200
+
+
+def test_small_boards_keep_the_original_emoji():
+    assert [symbol for symbol, color in card_faces(18)] == EMOJIS
+    assert all(color is None for _, color in card_faces(18))
+
+
+def test_faces_extend_smaller_sets():
+    assert card_faces(200)[:50] == card_faces(50)
+
+
+def test_too_many_faces():
+    with pytest.raises(ValueError):
+        card_faces(MAX_FACES + 1)
+
+
+@pytest.mark.parametrize("label", list(DIFFICULTIES))
+def test_every_board_has_faces(label):
+    rows, cols = DIFFICULTIES[label]
+    game = MemoryGame(rows, cols)
+    faces = game.faces()
+    assert len(set(faces)) == game.num_pairs
+    args = board_args(game)
+    assert len(args["faces"]) == game.num_pairs and len(args["deck"]) == game.size
+    assert len(args["state"]) == game.size and args["cols"] == cols
@@ -0,0 +1,67 @@
+import sqlite3
+import threading
+
+import pytest
+
+from leaderboard_index import LeaderboardIndex
+from leaderboard_store import LeaderboardStore
+from leaderboard_writer import LeaderboardWriter
+
+HARD = "Hard (6x6)"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return LeaderboardStore(str(tmp_path / "leaderboard.db"))
+
+
+def count(store):
+    return store._conn.execute("SELECT COUNT(*) FROM scores").fetchone()[0]
+
+
+def test_submitted_rows_reach_the_store(store):
+    writer = LeaderboardWriter(store, LeaderboardIndex(store))
+    writer.submit("Ann", HARD, 20, "01:00", "2025-01-01 12:00:00")
+    writer.submit("Bob", HARD, 18, "00:50", "2025-01-01 12:01:00")
+    assert writer.flush(5.0)
+    assert writer.pending() == []
+    assert [row[0] for row in writer.top_scores(HARD)] == ["Bob", "Ann"]
+    assert count(store) == 2
+
+
+def test_pending_rows_are_read_back_once(store, monkeypatch):
+    # The first commit fails, so the row sits in the queue for the retry delay
+    store.add_score("Bob", HARD, 30, "02:00", "2025-01-01 12:00:00")
+    failed = threading.Event()
+    add_scores = store.add_scores
+
+    def flaky(rows):
+        if not failed.is_set():
+            failed.set()
+            raise sqlite3.OperationalError("database is locked")
+        add_scores(rows)
+
+    monkeypatch.setattr(store, "add_scores", flaky)
+    writer = LeaderboardWriter(store, LeaderboardIndex(store))
+    writer.submit("Ann", HARD, 20, "01:00", "2025-01-02 12:00:00")
+    assert failed.wait(5.0)
+    # Read-your-own-write: the queued score shows up before it is committed
+    assert [row[0] for row in writer.top_scores(HARD)] == ["Ann", "Bob"]
+    assert writer.personal_best("Ann", HARD)[2] == 20
+    assert writer.flush(5.0)
+    assert [row[0] for row in writer.top_scores(HARD)] == ["Ann", "Bob"]
+    assert count(store) == 2
+
+
+def test_failing_listener_does_not_duplicate_rows(store):
+    def broken(rows, old, new):
+        raise OSError("stats file not writable")
+
+    store.subscribe(broken)
+    index = LeaderboardIndex(store)
+    writer = LeaderboardWriter(store, index)
+    writer.submit("Ann", HARD, 20, "01:00", "2025-01-01 12:00:00")
+    assert writer.flush(5.0)
+    assert count(store) == 1
+    assert writer.pending() == []
+    assert [row[0] for row in writer.top_scores(HARD)] == ["Ann"]
@@ -0,0 +1,146 @@
+"""Light and Dark page stylesheets.
+
+Each theme's CSS is built once and written to static/, which Streamlit serves
+at app/static/ (server.enableStaticServing in .streamlit/config.toml). A rerun
+then only sends a short @import of that file, and the browser caches it. Fonts
+come from the local system: no request leaves the machine.
+
+    python theme.py    # regenerate static/theme-*.css
+"""
+import hashlib
+import os
+from functools import lru_cache
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+STATIC_URL = "app/static"
+
+THEMES = {
+    "Light": {
+        "page": "linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%)",
+        "sidebar": "linear-gradient(180deg, #ffffff 0%, #f1f5f9 100%)",
+        "sidebar_text": "black",
+        "track": "rgba(203, 213, 225, 0.5)",
+        "card": "rgba(255, 255, 255, 0.8)",
+        "card_border": "rgba(203, 213, 225, 0.3)",
+        "card_shadow": "rgba(0,0,0,0.1)",
+    },
+    "Dark": {
+        "page": "linear-gradient(135deg, #0f172a 0%, #1e293b 100%)",
+        "sidebar": "linear-gradient(180deg, #1e293b 0%, #334155 100%)",
+        "sidebar_text": "white",
+        "track": "rgba(51, 65, 85, 0.3)",
+        "card": "rgba(30, 41, 59, 0.8)",
+        "card_border": "rgba(71, 85, 105, 0.3)",
+        "card_shadow": "rgba(0,0,0,0.3)",
+    },
+}
+
+# Poppins if it is installed locally, otherwise the platform UI font
+FONT_STACK = "'Poppins', system-ui, -apple-system, 'Segoe UI', Roboto, sans-serif"
+
+FONT_FACES = "".join(
+    f"@font-face {{ font-family: 'Poppins'; font-weight: {weight}; "
+    f"src: local('Poppins {name}'), local('Poppins-{name}'); }}\n"
+    for weight, name in ((400, "Regular"), (600, "SemiBold"), (700, "Bold"))
+)
+
+
+@lru_cache(maxsize=None)
+def stylesheet(theme):
+    """Page CSS for a theme (card styles live in the board component)"""
+    c = THEMES[theme]
+    return FONT_FACES + f"""
+body {{
+    font-family: {FONT_STACK};
+    background: {c['page']};
+}}
+
+[data-testid="stSidebar"] {{
+    background: {c['sidebar']} !important;
+    color: {c['sidebar_text']} !important;
+}}
+
+.progress-container {{
+    width: 100%;
+    height: 20px;
+    background: {c['track']};
+    border-radius: 10px;
+    overflow: hidden;
+    margin: 10px 0;
+    box-shadow: inset 0 2px 4px rgba(0,0,0,0.1);
+}}
+
+.progress-bar {{
+    height: 100%;
+    background: linear-gradient(90deg, #3b82f6, #1d4ed8);
+    border-radius: 10px;
+    transition: width 0.5s ease-in-out;
+    position: relative;
+    overflow: hidden;
+}}
+
+.progress-bar::after {{
+    content: '';
+    position: absolute;
+    top: 0;
+    left: -100%;
+    width: 100%;
+    height: 100%;
+    background: linear-gradient(90deg, transparent, rgba(255,255,255,0.3), transparent);
+    animation: shimmer 2s infinite;
+}}
+
+@keyframes shimmer {{
+    0% {{ left: -100%; }}
+    100% {{ left: 100%; }}
+}}
+
+.stats-card {{
+    background: {c['card']};
+    backdrop-filter: blur(10px);
+    border-radius: 15px;
+    padding: 20px;
+    margin: 10px 0;
+    border: 1px solid {c['card_border']};
+    box-shadow: 0 8px 32px {c['card_shadow']};
+}}
+
+@media (max-width: 768px) {{
+    .stats-card {{
+        padding: 15px;
+        margin: 5px 0;
+    }}
+}}
+"""
+
+
+def static_path(theme):
+    return os.path.join(STATIC_DIR, f"theme-{theme.lower()}.css")
+
+
+def write_static(directory=STATIC_DIR):
+    """Write every theme's stylesheet to `directory`, skipping files that are up to date"""
+    os.makedirs(directory, exist_ok=True)
+    for theme in THEMES:
+        path = os.path.join(directory, os.path.basename(static_path(theme)))
+        css = stylesheet(theme)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                if f.read() == css:
+                    continue
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(css)
+
+
+@lru_cache(maxsize=None)
+def stylesheet_tag(theme):
+    """Tiny <style> that imports the theme's static stylesheet; the hash busts stale browser caches"""
+    digest = hashlib.sha1(stylesheet(theme).encode()).hexdigest()[:8]
+    name = os.path.basename(static_path(theme))
+    return f"<style>@import url('{STATIC_URL}/{name}?v={digest}');</style>"
+
+
+if __name__ == "__main__":
+    write_static()
+    for theme in THEMES:
+        print(static_path(theme))